@@ -79,6 +79,8 @@ let micEnabled = false;
 let videoEnabled = false;
 const videoElements = new Map();
 const videoLastFrameAt = new Map();
+const videoFrameUrls = new Map();
+const videoFrameNameDecoder = new TextDecoder();
 let leaveTimerId = null;
 let leaveDeadlineMs = null;
 const LEAVE_GRACE_PERIOD_MS = 20000;
@@ -260,7 +262,7 @@ function applyPresenceSnapshot(entries) {
   refreshPresenceUi();
 }
 
-function updatePresenceEntry(entry) {
+function updatePresenceEntry(entry, { refresh = true } = {}) {
   if (!entry || !entry.username) {
     return;
   }
@@ -288,6 +290,21 @@ function updatePresenceEntry(entry) {
     updateLatencyBadge(merged.latency_ms, merged.jitter_ms);
     updateControlButtons();
   }
+  if (refresh) {
+    refreshPresenceUi();
+  }
+}
+
+function applyPresenceBatch(updates) {
+  if (!Array.isArray(updates) || updates.length === 0) {
+    return;
+  }
+  updates.forEach((raw) => {
+    const normalized = normalizePresenceEntry(raw, { partial: true });
+    if (normalized) {
+      updatePresenceEntry(normalized, { refresh: false });
+    }
+  });
   refreshPresenceUi();
 }
 
@@ -741,10 +758,14 @@ async function uploadFilesSequentially(fileList) {
     return;
   }
   for (const file of fileList) {
-    const data = new FormData();
-    data.append("file", file);
     try {
-      const res = await fetch("/api/files/upload", { method: "POST", body: data });
+      // The raw file is the request body; the browser supplies Content-Length.
+      const url = `/api/files/upload?filename=${encodeURIComponent(file.name)}`;
+      const res = await fetch(url, {
+        method: "POST",
+        body: file,
+        headers: { "Content-Type": "application/octet-stream" },
+      });
       if (!res.ok) {
         let message = `Upload failed for ${file.name}`;
         try {
@@ -1571,6 +1592,7 @@ function markVideoInactive(username) {
   }
   img.src = "";
   img.removeAttribute("src");
+  releaseVideoFrameUrl(username);
   const tile = img.parentElement;
   if (tile) {
     tile.classList.add("video-muted");
@@ -1740,6 +1762,7 @@ function pick(arr) {
 
 function connectSocket() {
   socket = new WebSocket(`ws://${window.location.host}/ws/control`);
+  socket.binaryType = "arraybuffer";
   socket.addEventListener("open", () => {
     socketReady = true;
     flashStatus("Connected to server", "info", 2000);
@@ -1751,6 +1774,10 @@ function connectSocket() {
     }
   });
   socket.addEventListener("message", (event) => {
+    if (event.data instanceof ArrayBuffer) {
+      handleBinaryVideoFrame(event.data);
+      return;
+    }
     try {
       const msg = JSON.parse(event.data);
       handleServerEvent(msg.type, msg.payload || {});
@@ -1778,6 +1805,16 @@ function sendControl(type, payload = {}) {
 }
 
 function handleServerEvent(type, payload) {
+  if (type === "batch") {
+    // Frames produced in the same server tick arrive together; replay them in order.
+    const frames = Array.isArray(payload.frames) ? payload.frames : [];
+    frames.forEach((frame) => {
+      if (frame && typeof frame.type === "string") {
+        handleServerEvent(frame.type, frame.payload || {});
+      }
+    });
+    return;
+  }
   if (wasKicked && type !== "session_status" && type !== "kicked") {
     return;
   }
@@ -1815,9 +1852,6 @@ function handleServerEvent(type, payload) {
     case "chat_message":
       appendChatMessage(payload);
       break;
-    case "video_frame":
-      updateVideoTile(payload.username, payload.frame);
-      break;
     case "video_status":
       handleVideoStatus(payload);
       break;
@@ -1851,6 +1885,9 @@ function handleServerEvent(type, payload) {
     case "presence_sync":
       applyPresenceSnapshot(payload.participants || []);
       break;
+    case "presence_batch":
+      applyPresenceBatch(payload.updates);
+      break;
     case "presence_update":
       {
         const normalized = normalizePresenceEntry(payload, { partial: true });
@@ -2456,17 +2493,44 @@ function removeVideoTile(username) {
   const img = videoElements.get(username);
   if (!img) return;
   videoElements.delete(username);
+  releaseVideoFrameUrl(username);
   const tile = img.parentElement;
   tile?.remove();
   ensureVideoPlaceholder();
   videoLastFrameAt.delete(username);
 }
 
+// Video frames arrive as binary messages: a 2-byte big-endian username length, the
+// UTF-8 username, then the raw JPEG.
+function handleBinaryVideoFrame(buffer) {
+  if (wasKicked || buffer.byteLength < 2) {
+    return;
+  }
+  const nameLength = new DataView(buffer).getUint16(0);
+  if (buffer.byteLength < 2 + nameLength) {
+    return;
+  }
+  const username = videoFrameNameDecoder.decode(new Uint8Array(buffer, 2, nameLength));
+  const frame = new Blob([new Uint8Array(buffer, 2 + nameLength)], { type: "image/jpeg" });
+  updateVideoTile(username, frame);
+}
+
+function releaseVideoFrameUrl(username) {
+  const url = videoFrameUrls.get(username);
+  if (url) {
+    URL.revokeObjectURL(url);
+    videoFrameUrls.delete(username);
+  }
+}
+
 function updateVideoTile(username, frame) {
   ensureVideoTile(username);
   const img = videoElements.get(username);
   if (img) {
-    img.src = `data:image/jpeg;base64,${frame}`;
+    releaseVideoFrameUrl(username);
+    const url = URL.createObjectURL(frame);
+    videoFrameUrls.set(username, url);
+    img.src = url;
     markVideoFrameReceived(username);
   }
 }
@@ -1,34 +1,208 @@
 from __future__ import annotations
 
-import argparse
 import asyncio
 import logging
+import os
+import socket
+import sys
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Coroutine, Dict, List, Union
 
-from shared.protocol import DEFAULT_TCP_PORT
+if TYPE_CHECKING:
+    import argparse
 
-from client.app import ClientApp
+# Options taking a value, mapped to their destination attribute.
+_VALUE_OPTIONS = {
+    "--tcp-port": "tcp_port",
+    "--ui-host": "ui_host",
+    "--ui-port": "ui_port",
+    "--username": "username",
+    "--pre-shared-key": "pre_shared_key",
+    "--log-level": "log_level",
+    "--download-redirect-prefix": "download_redirect_prefix",
+}
+# Boolean switches, mapped to their destination attribute.
+_FLAG_OPTIONS = {"--no-browser": "no_browser"}
+_INT_OPTIONS = frozenset({"tcp_port", "ui_port"})
+_LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
 
 
-def main() -> None:
+def _build_parser() -> "argparse.ArgumentParser":
+    import argparse
+
+    from shared.protocol import DEFAULT_TCP_PORT
+
     parser = argparse.ArgumentParser(description="LAN collaboration suite client")
     parser.add_argument("server_host", nargs="?", help="Hostname or IP of the collaboration server")
-    parser.add_argument("--tcp-port", type=int, default=DEFAULT_TCP_PORT, help="Server TCP port")
-    parser.add_argument("--ui-host", default="127.0.0.1", help="Host to bind the local UI web server")
-    parser.add_argument("--ui-port", type=int, default=8100, help="Port for the local UI web server")
+    parser.add_argument(
+        "--tcp-port",
+        type=int,
+        default=None,
+        help=f"Server TCP port (default: {DEFAULT_TCP_PORT})",
+    )
+    parser.add_argument(
+        "--ui-host",
+        default="127.0.0.1",
+        help="Host to bind the local UI web server",
+    )
+    parser.add_argument(
+        "--ui-port",
+        type=int,
+        default=8100,
+        help="Port for the local UI web server",
+    )
     parser.add_argument("--username", help="Optional display name to pre-fill in the UI")
     parser.add_argument("--pre-shared-key", help="Optional pre-shared key required by the server")
     parser.add_argument(
         "--log-level",
+        type=str.upper,
         default="INFO",
+        choices=list(_LOG_LEVELS),
         help="Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)",
     )
-    args = parser.parse_args()
-
-    log_level = getattr(logging, str(args.log_level).upper(), logging.INFO)
-    logging.basicConfig(
-        level=log_level,
-        format="[%(asctime)s] %(levelname)s %(name)s: %(message)s",
+    parser.add_argument(
+        "--download-redirect-prefix",
+        help="Internal proxy location serving the server's file storage; downloads are "
+        "then delegated to the proxy with X-Accel-Redirect",
+    )
+    parser.add_argument(
+        "--no-browser",
+        action="store_true",
+        help="Do not open the web UI in a browser tab on start-up",
     )
+    return parser
+
+
+def _parse_args(argv: List[str]) -> Union[SimpleNamespace, "argparse.Namespace"]:
+    """Parse the command line without building an ArgumentParser on the common path.
+
+    Anything the fast path does not recognise (``--help``, abbreviations, malformed
+    values) is handed to argparse so usage and error output stay unchanged.
+    """
+    values: Dict[str, object] = {
+        "server_host": None,
+        "tcp_port": None,
+        "ui_host": "127.0.0.1",
+        "ui_port": 8100,
+        "username": None,
+        "pre_shared_key": None,
+        "log_level": "INFO",
+        "no_browser": False,
+        "download_redirect_prefix": None,
+    }
+    index = 0
+    while index < len(argv):
+        arg = argv[index]
+        index += 1
+        if not arg.startswith("-"):
+            if values["server_host"] is not None:
+                return _build_parser().parse_args(argv)
+            values["server_host"] = arg
+            continue
+        flag = _FLAG_OPTIONS.get(arg)
+        if flag is not None:
+            values[flag] = True
+            continue
+        name, has_value, value = arg.partition("=")
+        dest = _VALUE_OPTIONS.get(name)
+        if dest is None:
+            return _build_parser().parse_args(argv)
+        if not has_value:
+            if index >= len(argv):
+                return _build_parser().parse_args(argv)
+            value = argv[index]
+            if value.startswith("-"):
+                # argparse reports the missing value rather than taking the next option.
+                return _build_parser().parse_args(argv)
+            index += 1
+        if dest in _INT_OPTIONS:
+            try:
+                values[dest] = int(value)
+            except ValueError:
+                return _build_parser().parse_args(argv)
+        elif dest == "log_level":
+            value = value.upper()
+            if value not in _LOG_LEVELS:
+                return _build_parser().parse_args(argv)
+            values[dest] = value
+        else:
+            values[dest] = value
+    return SimpleNamespace(**values)
+
+
+def _bind_ui_socket(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        if os.name != "nt":
+            # Lets the UI port be rebound immediately after a restart. SO_REUSEPORT is
+            # deliberately not used: it would let two clients share one UI port.
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # Accepted connections inherit this, so small UI frames are never held by Nagle.
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.bind((host, port))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    try:
+        import uvloop
+    except ImportError:
+        loop = asyncio.new_event_loop()
+        # BaseEventLoop.time() is a Python wrapper around time.monotonic(); binding the
+        # C function directly removes a frame from every loop iteration.
+        loop.time = time.monotonic  # type: ignore[method-assign]
+        return loop
+    return uvloop.new_event_loop()
+
+
+def _run(main_coro: Coroutine[object, object, None]) -> None:
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(debug=False, loop_factory=_new_event_loop) as runner:
+            runner.run(main_coro)
+        return
+
+    loop = _new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_until_complete(main_coro)
+    finally:
+        try:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+
+def main() -> None:
+    args = _parse_args(sys.argv[1:])
+
+    log_level = _LOG_LEVELS[args.log_level]
+    # Records never use thread/process fields, so skip populating them per record.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    if log_level <= logging.DEBUG:
+        log_format = "[%(asctime)s] %(levelname)s %(name)s: %(message)s"
+    else:
+        # Timestamps cost a strftime per record; only pay for them when debugging.
+        log_format = "%(levelname)s %(name)s: %(message)s"
+    logging.basicConfig(level=log_level, format=log_format)
 
     server_host = args.server_host
     if not server_host:
@@ -40,15 +214,38 @@ def main() -> None:
         print("A server hostname or IP is required to start the client.")
         return
 
-    app = ClientApp(
-        username=args.username,
+    # Deferred so --help and argument errors never pay for the UI/media import graph.
+    from client.app import ClientApp, ClientConfig
+    from shared.protocol import DEFAULT_TCP_PORT
+
+    config = ClientConfig(
         server_host=server_host,
-        tcp_port=args.tcp_port,
+        tcp_port=args.tcp_port if args.tcp_port is not None else DEFAULT_TCP_PORT,
+        ui_host=args.ui_host,
+        ui_port=args.ui_port,
+        username=args.username,
         pre_shared_key=args.pre_shared_key,
+        log_level=log_level,
+        open_browser=not args.no_browser,
+        download_redirect_prefix=args.download_redirect_prefix,
     )
+    app = ClientApp.from_config(config)
+
+    try:
+        ui_sock = _bind_ui_socket(config.ui_host, config.ui_port)
+    except OSError as exc:
+        print(f"Unable to bind the UI server on {config.ui_host}:{config.ui_port}: {exc}")
+        return
 
     try:
-        asyncio.run(app.run(host=args.ui_host, port=args.ui_port))
+        _run(
+            app.run(
+                host=config.ui_host,
+                port=config.ui_port,
+                sock=ui_sock,
+                open_browser=config.open_browser,
+            )
+        )
     except KeyboardInterrupt:
         pass
     except asyncio.CancelledError:
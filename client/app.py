@@ -1,18 +1,39 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import codecs
+import functools
 import logging
-import os
 import random
+import socket
+import struct
 import time
 import webbrowser
-from typing import Awaitable, Callable, Dict, List, Optional, Set
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+from urllib.parse import quote
 
-from fastapi import File, FastAPI, HTTPException, UploadFile, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, StreamingResponse
+import orjson
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from starlette.websockets import WebSocketState
 
 from shared.protocol import (
     ControlAction,
@@ -21,6 +42,10 @@ from shared.protocol import (
     DEFAULT_SCREEN_PORT,
     DEFAULT_TCP_PORT,
     DEFAULT_VIDEO_PORT,
+    LATENCY_PROBE_PREFIX_STRUCT,
+    LATENCY_PROBE_VERSION,
+    LATENCY_REPLY_STRUCT,
+    latency_probe_tag,
 )
 
 from .control_client import ControlClient
@@ -33,10 +58,146 @@ from shared.resource_paths import project_root
 logger = logging.getLogger(__name__)
 
 MAX_UPLOAD_SIZE_BYTES = 50 * 1024 * 1024  # 50 MB limit
+UPLOAD_PROGRESS_INTERVAL_SECONDS = 0.05
+# Downloads are streamed from FileClient in pieces of at least this size.
+DOWNLOAD_COALESCE_BYTES = 128 * 1024
 RECONNECT_BASE_DELAY_SECONDS = 2.0
 RECONNECT_MAX_DELAY_SECONDS = 30.0
 LATENCY_SAMPLE_INTERVAL_SECONDS = 5.0
+# How long a presence change may wait so that a burst of them shares one UI frame.
+PRESENCE_FLUSH_DELAY_SECONDS = 0.06
+LATENCY_METRICS_MIN_INTERVAL_SECONDS = 0.25
+# Frames a UI socket may have waiting before its oldest ones are dropped.
+UI_SEND_QUEUE_LIMIT = 256
+# Most queued frames a UI writer merges into one batch message.
+UI_WRITE_BATCH_LIMIT = 32
+# Closed or suspended browser tabs stop answering pings and are dropped after this.
+UI_WS_PING_INTERVAL_SECONDS = 20.0
+LATENCY_PENDING_LIMIT = 64
+LATENCY_SOCKET_BUFFER_BYTES = 1 << 20
+# Latency readings that move less than this are not re-broadcast as presence changes.
+LATENCY_CHANGE_THRESHOLD_MS = 1.0
 TIME_LIMIT_LEAVE_REASON = "Meeting time limit reached"
+CHAT_HISTORY_LIMIT = 200
+REACTION_LOG_LIMIT = 200
+ADMIN_NOTICE_LIMIT = 100
+FILE_CATALOG_LIMIT = 500
+_HAS_ASYNCIO_TIMEOUT = hasattr(asyncio, "timeout")  # Python 3.11+
+
+_USERNAME_ADJECTIVES = ("swift", "bright", "lively", "bold", "stellar", "brisk", "clever")
+_USERNAME_NOUNS = ("lynx", "sparrow", "otter", "falcon", "fox", "orca", "aurora")
+# Every adjective/noun combination, so a suggestion costs a single choice().
+_USERNAME_PAIRS = tuple(
+    (adjective, noun) for adjective in _USERNAME_ADJECTIVES for noun in _USERNAME_NOUNS
+)
+
+# Printable ASCII except backslash and double quote survives; every other byte becomes "_".
+_SAFE_FILENAME_TABLE = bytes(
+    c if 32 <= c < 127 and c not in (0x5C, 0x22) else 0x5F for c in range(256)
+)
+_FILENAME_ERRORS = "lanmeet.filename"
+# One "_" per unencodable character, matching the width of the original name.
+codecs.register_error(_FILENAME_ERRORS, lambda exc: ("_" * (exc.end - exc.start), exc.end))
+
+# Plain wire strings for each action, so relaying a frame skips the enum descriptor.
+_ACTION_VALUES: Dict[ControlAction, str] = {action: action.value for action in ControlAction}
+
+# Control handlers may return a replacement payload to relay to the UI.
+_ControlHandler = Callable[[Dict[str, object]], Awaitable[Optional[Dict[str, object]]]]
+# UI message handlers return the coroutine still to be awaited, or None when done.
+_UiHandler = Callable[[Dict[str, object]], Optional[Awaitable[None]]]
+_T = TypeVar("_T")
+
+
+def _tail(items: Deque[_T], count: int) -> List[_T]:
+    """Return the last ``count`` items of a deque, which does not support slicing."""
+    start = len(items) - count
+    return list(islice(items, start, None)) if start > 0 else list(items)
+
+
+_AsyncMethod = TypeVar("_AsyncMethod", bound=Callable[..., Awaitable[Any]])
+
+
+def _invalidates_snapshot(method: _AsyncMethod) -> _AsyncMethod:
+    """Drop the cached UI snapshot before and after a coroutine that mutates session state."""
+
+    @functools.wraps(method)
+    async def wrapper(self: "ClientApp", *args: Any, **kwargs: Any) -> Any:
+        # Cleared on both sides so a snapshot built while the method is suspended
+        # mid-update is never served after it finishes.
+        self._snapshot_text = None
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            self._snapshot_text = None
+
+    return wrapper  # type: ignore[return-value]
+
+
+@dataclass(slots=True, frozen=True)
+class ClientConfig:
+    """Validated command-line settings for a client runtime."""
+
+    server_host: str
+    tcp_port: int = DEFAULT_TCP_PORT
+    ui_host: str = "127.0.0.1"
+    ui_port: int = 8100
+    username: Optional[str] = None
+    pre_shared_key: Optional[str] = None
+    log_level: int = logging.INFO
+    open_browser: bool = True
+    download_redirect_prefix: Optional[str] = None
+
+
+# Every field the server's presence payload carries; such entries skip re-coercion.
+_PRESENCE_WIRE_FIELDS = frozenset(
+    {
+        "username",
+        "audio_enabled",
+        "video_enabled",
+        "hand_raised",
+        "is_typing",
+        "is_presenter",
+        "last_seen_seconds",
+        "latency_ms",
+        "jitter_ms",
+    }
+)
+# Marks an omitted ``username`` so an explicit ``None`` is still passed through.
+_DEFAULT_USERNAME: Any = object()
+
+# Binary video frames sent to the UI start with the username's UTF-8 length.
+_VIDEO_FRAME_NAME_LENGTH = struct.Struct("!H")
+
+
+@dataclass(slots=True)
+class PresenceEntry:
+    """Presence state for one participant, encoded as-is into UI messages."""
+
+    username: str
+    audio_enabled: bool = False
+    video_enabled: bool = False
+    hand_raised: bool = False
+    is_typing: bool = False
+    is_presenter: bool = False
+    last_seen_seconds: float = 0.0
+    latency_ms: Optional[float] = None
+    jitter_ms: Optional[float] = None
+    is_self: bool = False
+
+    def as_tuple(self) -> Tuple[object, ...]:
+        return (
+            self.username,
+            self.audio_enabled,
+            self.video_enabled,
+            self.hand_raised,
+            self.is_typing,
+            self.is_presenter,
+            self.last_seen_seconds,
+            self.latency_ms,
+            self.jitter_ms,
+            self.is_self,
+        )
 
 
 class _LatencyProbeProtocol(asyncio.DatagramProtocol):
@@ -61,20 +222,25 @@ class LatencyProbe:
         *,
         pre_shared_key: Optional[str] = None,
     interval: float = LATENCY_SAMPLE_INTERVAL_SECONDS,
-        on_metrics: Optional[Callable[[float, Optional[float]], Awaitable[None] | None]] = None,
+        on_metrics: Optional[Callable[[float, Optional[float]], Awaitable[None]]] = None,
     ) -> None:
         self._username = username
         self._server_host = server_host
         self._server_port = server_port
-        self._pre_shared_key = pre_shared_key
         self._interval = max(1.0, interval)
         self._on_metrics = on_metrics
         self._transport: Optional[asyncio.DatagramTransport] = None
         self._task: Optional[asyncio.Task[None]] = None
         self._running = False
         self._sequence = 0
-        self._pending: Dict[int, float] = {}
+        # Sequence -> monotonic send time, oldest first, so lost probes can be pruned.
+        self._pending: "OrderedDict[int, int]" = OrderedDict()
         self._previous_latency: Optional[float] = None
+        # on_metrics is async and runs as a task per sample; hold strong references so
+        # the loop's weak task registry cannot drop one mid-flight.
+        self._background: Set[asyncio.Task[None]] = set()
+        self._pre_shared_key = pre_shared_key
+        self._username_bytes = username.encode("utf-8")
 
     async def start(self) -> None:
         if self._running:
@@ -85,10 +251,30 @@ class LatencyProbe:
             local_addr=("0.0.0.0", 0),
         )
         self._transport = transport
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            self._tune_socket(sock)
         self._running = True
         self._task = asyncio.create_task(self._run())
         logger.debug("Latency probe started for %s", self._username)
 
+    @staticmethod
+    def _tune_socket(sock: socket.socket) -> None:
+        # Best effort: explicit buffers so a burst of replies is not dropped, and the
+        # low-delay TOS bit for routers that honour it. SO_REUSEPORT is not needed
+        # because the probe binds an ephemeral port.
+        options = [
+            (socket.SOL_SOCKET, socket.SO_RCVBUF, LATENCY_SOCKET_BUFFER_BYTES),
+            (socket.SOL_SOCKET, socket.SO_SNDBUF, LATENCY_SOCKET_BUFFER_BYTES),
+        ]
+        if hasattr(socket, "IP_TOS"):
+            options.append((socket.IPPROTO_IP, socket.IP_TOS, 0x10))
+        for level, option, value in options:
+            try:
+                sock.setsockopt(level, option, value)
+            except OSError:
+                logger.debug("Latency probe socket option %s not applied", option, exc_info=True)
+
     async def stop(self) -> None:
         self._running = False
         if self._task:
@@ -105,27 +291,51 @@ class LatencyProbe:
         logger.debug("Latency probe stopped for %s", self._username)
 
     async def _run(self) -> None:
+        # Sleep to a fixed deadline rather than for a fixed interval so the time spent
+        # sending does not stretch the cadence that jitter is measured against.
+        deadline = time.monotonic()
         try:
             while self._running:
+                deadline += self._interval
                 await self._send_probe()
-                await asyncio.sleep(self._interval)
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    # Fell behind (e.g. the loop was blocked); resume from now instead of
+                    # firing a burst of catch-up probes.
+                    deadline = time.monotonic()
         except asyncio.CancelledError:  # pragma: no cover - task cancellation
             return
 
     async def _send_probe(self) -> None:
         if not self._transport:
             return
+        if self._transport.get_write_buffer_size():
+            # The previous datagram is still queued in the transport (socket buffer
+            # full, typically right after a reconnect); stacking more behind it would
+            # only measure our own queueing delay.
+            logger.debug("Skipping latency probe while the send buffer drains")
+            return
         self._sequence = (self._sequence + 1) % (2**31)
         timestamp_ms = int(time.time() * 1000)
-        payload = {
-            "username": self._username,
-            "timestamp_ms": timestamp_ms,
-            "sequence": self._sequence,
-        }
-        if self._pre_shared_key:
-            payload["pre_shared_key"] = self._pre_shared_key
-        message = json.dumps(payload, separators=(",", ":")).encode("utf-8")
-        self._pending[self._sequence] = timestamp_ms
+        prefix = LATENCY_PROBE_PREFIX_STRUCT.pack(
+            LATENCY_PROBE_VERSION, self._sequence, timestamp_ms
+        )
+        tag = latency_probe_tag(prefix, self._username_bytes, self._pre_shared_key)
+        message = prefix + tag + self._username_bytes
+        # RTT uses the monotonic clock; the wall-clock timestamp above is only echoed
+        # back by the server, so clock steps can no longer skew samples.
+        now_ns = time.monotonic_ns()
+        pending = self._pending
+        pending[self._sequence] = now_ns
+        # Replies to dropped datagrams never arrive; expire them instead of letting
+        # the map grow for the lifetime of the session.
+        cutoff_ns = now_ns - int(self._interval * 2 * 1_000_000_000)
+        while pending:
+            if len(pending) <= LATENCY_PENDING_LIMIT and next(iter(pending.values())) >= cutoff_ns:
+                break
+            pending.popitem(last=False)
         try:
             self._transport.sendto(message, (self._server_host, self._server_port))
         except Exception:
@@ -134,20 +344,17 @@ class LatencyProbe:
     def _handle_packet(self, data: bytes) -> None:
         if not self._running:
             return
-        try:
-            payload = json.loads(data.decode("utf-8"))
-        except (UnicodeDecodeError, json.JSONDecodeError):
+        if len(data) < LATENCY_REPLY_STRUCT.size:
             logger.debug("Ignoring malformed latency response")
             return
-
-        sequence = payload.get("sequence")
-        if not isinstance(sequence, int):
+        version, sequence, _, _ = LATENCY_REPLY_STRUCT.unpack_from(data)
+        if version != LATENCY_PROBE_VERSION:
+            logger.debug("Ignoring latency response with unknown version %s", version)
             return
-        sent_timestamp = self._pending.pop(sequence, None)
-        if sent_timestamp is None:
+        sent_ns = self._pending.pop(sequence, None)
+        if sent_ns is None:
             return
-        now_ms = int(time.time() * 1000)
-        latency_ms = max(0.0, float(now_ms - sent_timestamp))
+        latency_ms = (time.monotonic_ns() - sent_ns) / 1_000_000.0
         jitter_ms: Optional[float] = None
         if self._previous_latency is not None:
             jitter_ms = abs(latency_ms - self._previous_latency)
@@ -155,43 +362,240 @@ class LatencyProbe:
         if self._on_metrics is None:
             return
         try:
-            result = self._on_metrics(latency_ms, jitter_ms)
-            if asyncio.iscoroutine(result):
-                asyncio.create_task(result)
+            task = asyncio.ensure_future(self._on_metrics(latency_ms, jitter_ms))
         except Exception:
             logger.exception("Latency metrics callback failed")
+            return
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+
+def _to_float(value: object) -> Optional[float]:
+    """Coerce a payload value to float, or None; well-typed values skip the try block."""
+    if value is None:
+        return None
+    value_type = type(value)
+    if value_type is float:
+        return value  # type: ignore[return-value]
+    if value_type is int:
+        return float(value)  # type: ignore[arg-type]
+    try:
+        return float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+
+
+def _latency_moved(old: Optional[float], new: Optional[float]) -> bool:
+    """Whether a latency reading differs enough from the stored one to be worth sending."""
+    if old is None or new is None:
+        return old is not new
+    return abs(new - old) >= LATENCY_CHANGE_THRESHOLD_MS
+
+
+def _to_int(value: object) -> Optional[int]:
+    """Coerce a payload value to int, or None; well-typed values skip the try block."""
+    if value is None:
+        return None
+    if type(value) is int:
+        return value  # type: ignore[return-value]
+    try:
+        return int(value)  # type: ignore[call-overload]
+    except (TypeError, ValueError):
+        return None
+
+
+async def _iter_upload(chunks: AsyncIterator[bytes], limit: int) -> AsyncIterator[bytes]:
+    """Pass a request body through, aborting as soon as more than ``limit`` bytes arrive."""
+    total = 0
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        total += len(chunk)
+        if total > limit:
+            max_mb = limit // (1024 * 1024)
+            raise HTTPException(status_code=413, detail=f"File exceeds {max_mb} MB limit")
+        yield chunk
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_ui_dirs() -> Tuple[Path, Path]:
+    """Locate the web UI and its assets once per process; they never move at runtime."""
+    root = project_root()
+    static_dir = root / "webui"
+
+    asset_candidates = [static_dir / "assets", root / "assets"]
+    assets_dir = next((candidate for candidate in asset_candidates if candidate.exists()), None)
+    if not assets_dir:
+        raise RuntimeError(
+            "Unable to locate static assets directory; expected one of: "
+            + ", ".join(str(p) for p in asset_candidates)
+        )
+    return static_dir, assets_dir
+
+
+@functools.lru_cache(maxsize=256)
+def _video_frame_prefix(username: str) -> bytes:
+    """Return the binary video frame header; usernames repeat on every frame."""
+    name = username.encode("utf-8")
+    return _VIDEO_FRAME_NAME_LENGTH.pack(len(name)) + name
+
+
+class _ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, the encoder already used for UI messages."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def _log_browser_launch_failure(launch: "asyncio.Future[bool]") -> None:
+    """Report a failed browser launch instead of leaving the exception unretrieved."""
+    if not launch.cancelled() and launch.exception() is not None:
+        logger.warning("Unable to open the web UI in a browser", exc_info=launch.exception())
+
+
+@functools.lru_cache(maxsize=32)
+def _session_status_text(state: str, username: Optional[str], message: Optional[str]) -> str:
+    """Return the encoded ``session_status`` message; the same few states repeat."""
+    return encode_ui_message(
+        {
+            "type": "session_status",
+            "payload": {"state": state, "username": username, "message": message},
+        }
+    )
+
+
+def encode_ui_message(message: Dict[str, object]) -> str:
+    """Serialise a UI message to compact JSON text for ``send_text``."""
+    return orjson.dumps(message).decode("utf-8")
+
+
+# A queued UI frame: (latest-wins key, text). Keyed entries carry no text; the writer
+# takes the newest text stored under the key when it reaches the entry.
+# Text messages are JSON; bytes are binary video frames (see _handle_video_frame).
+_UiMessage = Union[str, bytes]
+_QueuedFrame = Tuple[Optional[str], _UiMessage]
+
+
+@dataclass(slots=True)
+class _UiConnection:
+    queue: asyncio.Queue[_QueuedFrame]
+    writer: Optional[asyncio.Task[None]] = None
+    latest: Dict[str, _UiMessage] = field(default_factory=dict)
+
 
 class WebSocketHub:
-    """Tracks active UI WebSocket connections."""
+    """Tracks active UI WebSocket connections.
+
+    Every socket has its own bounded queue drained by a writer task, so a stalled tab
+    only loses its own oldest frames and never holds up the control plane.
+    """
+
+    __slots__ = ("_connections",)
 
     def __init__(self) -> None:
-        self._connections: List[WebSocket] = []
-        self._lock = asyncio.Lock()
+        # No lock needed: the mapping is only touched from the event loop thread and
+        # never across an await, so it cannot be observed half-updated.
+        self._connections: Dict[WebSocket, _UiConnection] = {}
 
     async def connect(self, ws: WebSocket) -> None:
         await ws.accept()
-        async with self._lock:
-            self._connections.append(ws)
+        connection = _UiConnection(asyncio.Queue(maxsize=UI_SEND_QUEUE_LIMIT))
+        connection.writer = asyncio.create_task(self._writer(ws, connection))
+        self._connections[ws] = connection
 
     async def disconnect(self, ws: WebSocket) -> None:
-        async with self._lock:
-            if ws in self._connections:
-                self._connections.remove(ws)
+        connection = self._connections.pop(ws, None)
+        if connection is not None and connection.writer is not None:
+            connection.writer.cancel()
+
+    @property
+    def has_connections(self) -> bool:
+        return bool(self._connections)
+
+    def send_text(self, ws: WebSocket, text: str) -> None:
+        """Queue an already JSON-encoded message for one UI, behind its pending frames."""
+        connection = self._connections.get(ws)
+        if connection is not None:
+            self._enqueue(connection, None, text)
 
     async def broadcast(self, message: Dict[str, object]) -> None:
-        async with self._lock:
-            for ws in list(self._connections):
-                try:
-                    if ws.application_state == WebSocketState.CONNECTED:
-                        await ws.send_json(message)
-                except Exception:
-                    logger.exception("Failed to send WebSocket message")
+        if not self._connections:
+            return
+        # Encode once rather than letting send_json re-serialise for every socket.
+        self.broadcast_text(encode_ui_message(message))
+
+    def broadcast_text(self, text: str) -> None:
+        """Queue an already JSON-encoded message for every connected UI."""
+        for connection in self._connections.values():
+            self._enqueue(connection, None, text)
+
+    def broadcast_latest(self, key: str, message: _UiMessage) -> None:
+        """Queue ``message`` for every UI, replacing any not-yet-sent one under ``key``."""
+        for connection in self._connections.values():
+            latest = connection.latest
+            if key not in latest:
+                self._enqueue(connection, key, "")
+            latest[key] = message
+
+    @staticmethod
+    def _enqueue(connection: _UiConnection, key: Optional[str], message: _UiMessage) -> None:
+        queue = connection.queue
+        if queue.full():
+            # A tab this far behind is better served by fresh frames than stale ones.
+            dropped_key, _ = queue.get_nowait()
+            if dropped_key is not None:
+                connection.latest.pop(dropped_key, None)
+        queue.put_nowait((key, message))
+
+    async def _writer(self, ws: WebSocket, connection: _UiConnection) -> None:
+        queue = connection.queue
+        latest = connection.latest
+        while True:
+            key, message = await queue.get()
+            if key is not None:
+                message = latest.pop(key)
+            # Text that piled up while the last send was in flight leaves as one "batch"
+            # message, so a burst costs one WebSocket write instead of many. A binary
+            # frame cannot join a batch, so it ends the batch and is sent right after it.
+            texts: List[str] = []
+            binary: Optional[bytes] = None
+            while True:
+                if isinstance(message, bytes):
+                    binary = message
+                    break
+                texts.append(message)
+                if len(texts) >= UI_WRITE_BATCH_LIMIT or queue.empty():
+                    break
+                key, message = queue.get_nowait()
+                if key is not None:
+                    message = latest.pop(key)
+            try:
+                if len(texts) == 1:
+                    await ws.send_text(texts[0])
+                elif texts:
+                    await ws.send_text(
+                        '{"type":"batch","payload":{"frames":[' + ",".join(texts) + "]}}"
+                    )
+                if binary is not None:
+                    await ws.send_bytes(binary)
+            except Exception:
+                logger.error("Failed to send WebSocket message", exc_info=True)
+                self._connections.pop(ws, None)
+                return
 
 
 class ClientApp:
     """Client runtime orchestrating control plane and local web UI."""
 
-    def __init__(self, username: Optional[str], server_host: str, tcp_port: int = DEFAULT_TCP_PORT, *, pre_shared_key: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        username: Optional[str],
+        server_host: str,
+        tcp_port: int = DEFAULT_TCP_PORT,
+        *,
+        pre_shared_key: Optional[str] = None,
+        download_redirect_prefix: Optional[str] = None,
+    ) -> None:
         self._prefill_username = username
         self._username: Optional[str] = None
         self._server_host = server_host
@@ -202,15 +606,18 @@ class ClientApp:
         self._screen_publisher: Optional[ScreenPublisher] = None
         self._video_client: Optional[VideoClient] = None
         self._audio_client: Optional[AudioClient] = None
-        self._media_config: Dict[str, int] = {
-            "video_port": DEFAULT_VIDEO_PORT,
-            "audio_port": DEFAULT_AUDIO_PORT,
-            "screen_port": DEFAULT_SCREEN_PORT,
-            "file_port": DEFAULT_FILE_PORT,
-        }
+        # Server-assigned ports; a change to any of them recreates the media helpers.
+        # The latency port stays unset until the server announces one.
+        self._video_port: int = DEFAULT_VIDEO_PORT
+        self._audio_port: int = DEFAULT_AUDIO_PORT
+        self._screen_port: int = DEFAULT_SCREEN_PORT
+        self._file_port: int = DEFAULT_FILE_PORT
+        self._latency_port: Optional[int] = None
         self._peers: List[str] = []
-        self._chat_history: List[Dict[str, object]] = []
-        self._file_catalog: Dict[str, Dict[str, object]] = {}
+        self._peer_set: Set[str] = set()
+        self._chat_history: Deque[Dict[str, object]] = deque(maxlen=CHAT_HISTORY_LIMIT)
+        # Most recently offered last; the oldest entries fall off past FILE_CATALOG_LIMIT.
+        self._file_catalog: OrderedDict[str, Dict[str, object]] = OrderedDict()
         self._peer_media: Dict[str, Dict[str, bool]] = {}
         self._presenter: Optional[str] = None
         self._audio_enabled = False
@@ -220,38 +627,105 @@ class ClientApp:
         self._kick_reason = None
         self._connected = False
         self._uvicorn_server = None
-        self._app = FastAPI()
+        self._app = FastAPI(default_response_class=_ORJSONResponse)
         self._pre_shared_key = pre_shared_key
-        self._presence: Dict[str, Dict[str, object]] = {}
+        # Internal location of a fronting proxy that can serve the server's file storage
+        # directly; when set, downloads are handed to it with X-Accel-Redirect.
+        self._download_redirect_prefix = (
+            download_redirect_prefix.rstrip("/") if download_redirect_prefix else None
+        )
+        self._presence: Dict[str, PresenceEntry] = {}
+        self._presence_sync_cache: Optional[Tuple[Tuple[Tuple[object, ...], ...], str]] = None
+        # Usernames whose presence changed since the last flush; sent as one presence_batch.
+        self._dirty_presence: Set[str] = set()
+        self._presence_flush_handle: Optional[asyncio.TimerHandle] = None
+        self._latency_metrics_handle: Optional[asyncio.TimerHandle] = None
+        self._latency_metrics_sent_at = 0.0
+        # Relayed control frames waiting for the end of the current loop tick.
+        self._outgoing_frames: List[Dict[str, object]] = []
+        self._outgoing_flush_handle: Optional[asyncio.Handle] = None
+        # Encoded state_snapshot frame; None whenever session state may have changed.
+        self._snapshot_text: Optional[str] = None
         self._latency_probe: Optional[LatencyProbe] = None
         self._own_latency: Optional[Dict[str, float]] = None
         self._should_reconnect = False
         self._reconnect_task: Optional[asyncio.Task[None]] = None
         self._reconnect_attempt = 0
-        self._reaction_log: List[Dict[str, object]] = []
+        self._reaction_log: Deque[Dict[str, object]] = deque(maxlen=REACTION_LOG_LIMIT)
         self._local_hand_raised = False
         self._latency_probe_port: Optional[int] = None
         self._time_limit: Optional[Dict[str, object]] = None
-        self._admin_notices: List[Dict[str, object]] = []
+        self._admin_notices: Deque[Dict[str, object]] = deque(maxlen=ADMIN_NOTICE_LIMIT)
         self._time_limit_exit_triggered = False
-        self._time_limit_expiry_task: Optional[asyncio.Task[None]] = None
+        # One long-lived watcher sleeps until the deadline; rescheduling just moves the
+        # deadline and wakes it through the event. The deadline is on the loop's monotonic
+        # clock, so a wall-clock step mid-meeting cannot shift it.
+        self._time_limit_deadline: Optional[float] = None
+        self._time_limit_event = asyncio.Event()
+        self._time_limit_watcher_task: Optional[asyncio.Task[None]] = None
+        self._control_handlers: Dict[ControlAction, _ControlHandler] = {
+            ControlAction.PRESENTER_GRANTED: self._on_presenter_granted,
+            ControlAction.PRESENTER_REVOKED: self._on_presenter_revoked,
+            ControlAction.WELCOME: self._on_welcome,
+            ControlAction.USER_JOINED: self._on_user_joined,
+            ControlAction.USER_LEFT: self._on_user_left,
+            ControlAction.CHAT_MESSAGE: self._on_chat_message,
+            ControlAction.FILE_OFFER: self._on_file_offer,
+            ControlAction.VIDEO_STATUS: self._on_video_status,
+            ControlAction.AUDIO_STATUS: self._on_audio_status,
+            ControlAction.KICKED: self._on_kicked,
+            ControlAction.PRESENCE_SYNC: self._on_presence_sync,
+            ControlAction.PRESENCE_UPDATE: self._on_presence_update,
+            ControlAction.TYPING_STATUS: self._on_typing_status,
+            ControlAction.HAND_STATUS: self._on_hand_status,
+            ControlAction.REACTION: self._on_reaction,
+            ControlAction.LATENCY_UPDATE: self._on_latency_update,
+            ControlAction.TIME_LIMIT_UPDATE: self._on_time_limit_update,
+            ControlAction.ADMIN_NOTICE: self._on_admin_notice,
+        }
+        self._ui_handlers: Dict[str, _UiHandler] = {
+            "join": self._ui_join,
+            "chat_send": self._ui_chat_send,
+            "request_presenter": self._ui_request_presenter,
+            "release_presenter": self._ui_release_presenter,
+            "file_request_list": self._ui_file_request_list,
+            "file_download": self._ui_file_download,
+            "toggle_audio": self._ui_toggle_audio,
+            "toggle_video": self._ui_toggle_video,
+            "typing": self._ui_typing,
+            "toggle_hand": self._ui_toggle_hand,
+            "send_reaction": self._ui_send_reaction,
+            "copy_file_link": self._ui_copy_file_link,
+            "toggle_presentation": self._ui_toggle_presentation,
+            "leave_session": self._ui_leave_session,
+            "heartbeat": self._ui_heartbeat,
+        }
         self._configure_routes()
 
-    def _configure_routes(self) -> None:
-        root = project_root()
-        static_dir = root / "webui"
-
-        asset_candidates = [static_dir / "assets", root / "assets"]
-        assets_dir = next((candidate for candidate in asset_candidates if candidate.exists()), None)
-        if not assets_dir:
-            raise RuntimeError("Unable to locate static assets directory; expected one of: " + ", ".join(str(p) for p in asset_candidates))
+    @classmethod
+    def from_config(cls, config: ClientConfig) -> "ClientApp":
+        return cls(
+            username=config.username,
+            server_host=config.server_host,
+            tcp_port=config.tcp_port,
+            pre_shared_key=config.pre_shared_key,
+            download_redirect_prefix=config.download_redirect_prefix,
+        )
 
+    def _configure_routes(self) -> None:
+        static_dir, assets_dir = _resolve_ui_dirs()
         self._app.mount("/assets", StaticFiles(directory=assets_dir), name="assets")
 
+        index_body: Optional[bytes] = None
+
         @self._app.get("/")
         async def index() -> HTMLResponse:
-            html_path = static_dir / "index.html"
-            return HTMLResponse(html_path.read_text(encoding="utf-8"))
+            # Read on first request and then served from memory; the page never changes
+            # while the client runs, and the bytes go out without a decode/encode.
+            nonlocal index_body
+            if index_body is None:
+                index_body = (static_dir / "index.html").read_bytes()
+            return HTMLResponse(index_body)
 
         @self._app.get("/api/config")
         async def config() -> Dict[str, object]:
@@ -269,27 +743,19 @@ class ClientApp:
         async def ws_control(websocket: WebSocket) -> None:
             await self._ws_hub.connect(websocket)
             try:
-                await websocket.send_json(
-                    {
-                        "type": "session_status",
-                        "payload": {
-                            "state": "connected"
-                            if self._connected
-                            else ("kicked" if self._kicked else "idle"),
-                            "username": self._username,
-                            "message": self._kick_reason,
-                        },
-                    }
+                # Queued through the hub so these stay ordered with concurrent broadcasts.
+                self._ws_hub.send_text(
+                    websocket,
+                    _session_status_text(
+                        "connected" if self._connected else ("kicked" if self._kicked else "idle"),
+                        self._username,
+                        self._kick_reason,
+                    ),
                 )
                 if self._connected:
-                    await websocket.send_json(
-                        {
-                            "type": "state_snapshot",
-                            "payload": self._build_snapshot(),
-                        }
-                    )
+                    self._ws_hub.send_text(websocket, self._snapshot_message())
                 while True:
-                    data = await websocket.receive_json()
+                    data = orjson.loads(await websocket.receive_text())
                     await self._handle_ui_message(data)
             except WebSocketDisconnect:
                 pass
@@ -297,88 +763,121 @@ class ClientApp:
                 await self._ws_hub.disconnect(websocket)
 
         @self._app.post("/api/files/upload")
-        async def upload_file(file: UploadFile = File(...)) -> Dict[str, object]:
-            if not file:
-                raise HTTPException(status_code=400, detail="File missing")
+        async def upload_file(request: Request, filename: str = "upload.bin") -> Dict[str, object]:
+            # The body is the raw file, streamed from the HTTP socket straight into the
+            # file-server connection with no multipart parsing or temp-file spooling.
             if self._file_client is None:
                 raise HTTPException(status_code=412, detail="Not connected to collaboration session")
 
-            size_bytes = await self._determine_upload_size(file)
+            size_bytes = self._declared_upload_size(request)
             if size_bytes > MAX_UPLOAD_SIZE_BYTES:
                 max_mb = MAX_UPLOAD_SIZE_BYTES // (1024 * 1024)
                 raise HTTPException(status_code=413, detail=f"File exceeds {max_mb} MB limit")
-            setattr(file, "size", size_bytes)
+
+            last_progress_at = 0.0
 
             async def report_progress(sent: int, total: int) -> None:
-                await self._ws_hub.broadcast(
+                # One frame per 64 KiB chunk would flood every tab; the final tick always
+                # goes out so the UI sees the upload complete.
+                nonlocal last_progress_at
+                now = time.monotonic()
+                if sent < total and now - last_progress_at < UPLOAD_PROGRESS_INTERVAL_SECONDS:
+                    return
+                last_progress_at = now
+                self._broadcast(
                     {
                         "type": "file_progress",
                         "payload": {
                             "file_id": None,
-                            "filename": file.filename,
+                            "filename": filename,
                             "received": sent,
                             "total_size": total,
                         },
                     }
                 )
 
-            file_id = await self._file_client.upload(file, progress=report_progress)
-            await self._ws_hub.broadcast(
+            file_id = await self._file_client.upload(
+                filename or "upload.bin",
+                _iter_upload(request.stream(), MAX_UPLOAD_SIZE_BYTES),
+                size_bytes,
+                progress=report_progress,
+            )
+            self._broadcast(
                 {
                     "type": "file_upload_complete",
                     "payload": {
                         "file_id": file_id,
-                        "filename": file.filename,
+                        "filename": filename,
                     },
                 }
             )
             return {"status": "ok", "file_id": file_id}
 
         @self._app.get("/api/files/download/{file_id}")
-        async def download_file(file_id: str) -> StreamingResponse:
+        async def download_file(file_id: str) -> Response:
             if self._file_client is None:
                 raise HTTPException(status_code=412, detail="Not connected to collaboration session")
+            prefix = self._download_redirect_prefix
+            if prefix is not None:
+                # The proxy sends the stored file itself; only catalogued ids are redirected.
+                entry = self._file_catalog.get(file_id)
+                if entry is None:
+                    raise HTTPException(status_code=404, detail=f"File {file_id} not found")
+                safe_name = self._sanitize_filename(str(entry.get("filename") or file_id))
+                return Response(
+                    media_type="application/octet-stream",
+                    headers={
+                        "X-Accel-Redirect": f"{prefix}/{quote(file_id, safe='')}",
+                        "Content-Disposition": f"attachment; filename=\"{safe_name}\"",
+                    },
+                )
             try:
-                metadata, stream = await self._file_client.download(file_id)
+                # The file server sends 64 KiB frames; fewer, larger pieces halve the
+                # per-chunk trips through Starlette and uvicorn.
+                metadata, stream = await self._file_client.download(
+                    file_id, min_chunk_size=DOWNLOAD_COALESCE_BYTES
+                )
             except FileNotFoundError as exc:  # pragma: no cover - network path
                 raise HTTPException(status_code=404, detail=f"File {file_id} not found") from exc
 
-            async def iterator():
-                async for chunk in stream:
-                    yield chunk
-
             original_name = metadata.get("filename") if isinstance(metadata, dict) else None
             safe_name = self._sanitize_filename(str(original_name or file_id))
             headers = {
                 "Content-Disposition": f"attachment; filename=\"{safe_name}\""
             }
-            return StreamingResponse(iterator(), media_type="application/octet-stream", headers=headers)
+            return StreamingResponse(stream, media_type="application/octet-stream", headers=headers)
 
-    def _normalize_presence_entry(self, raw: Dict[str, object]) -> Optional[Dict[str, object]]:
+    def _normalize_presence_entry(self, raw: Dict[str, object]) -> Optional[PresenceEntry]:
         username = raw.get("username")
         if not isinstance(username, str) or not username:
             return None
-        entry: Dict[str, object] = {
-            "username": username,
-            "audio_enabled": bool(raw.get("audio_enabled", False)),
-            "video_enabled": bool(raw.get("video_enabled", False)),
-            "hand_raised": bool(raw.get("hand_raised", False)),
-            "is_typing": bool(raw.get("is_typing", False)),
-            "is_presenter": bool(raw.get("is_presenter", False)),
-            "last_seen_seconds": float(raw.get("last_seen_seconds", 0.0) or 0.0),
-        }
-        latency_val = raw.get("latency_ms")
-        jitter_val = raw.get("jitter_ms")
-        try:
-            entry["latency_ms"] = float(latency_val) if latency_val is not None else None
-        except (TypeError, ValueError):
-            entry["latency_ms"] = None
-        try:
-            entry["jitter_ms"] = float(jitter_val) if jitter_val is not None else None
-        except (TypeError, ValueError):
-            entry["jitter_ms"] = None
-        entry["is_self"] = username == self._username
-        return entry
+        if raw.keys() >= _PRESENCE_WIRE_FIELDS:
+            # Complete entries come from SessionManager._client_presence_payload, whose
+            # flags are real bools; only the latency fields may arrive as ints.
+            return PresenceEntry(
+                username,
+                raw["audio_enabled"],  # type: ignore[arg-type]
+                raw["video_enabled"],  # type: ignore[arg-type]
+                raw["hand_raised"],  # type: ignore[arg-type]
+                raw["is_typing"],  # type: ignore[arg-type]
+                raw["is_presenter"],  # type: ignore[arg-type]
+                _to_float(raw["last_seen_seconds"]) or 0.0,
+                _to_float(raw["latency_ms"]),
+                _to_float(raw["jitter_ms"]),
+                username == self._username,
+            )
+        return PresenceEntry(
+            username=username,
+            audio_enabled=bool(raw.get("audio_enabled", False)),
+            video_enabled=bool(raw.get("video_enabled", False)),
+            hand_raised=bool(raw.get("hand_raised", False)),
+            is_typing=bool(raw.get("is_typing", False)),
+            is_presenter=bool(raw.get("is_presenter", False)),
+            last_seen_seconds=_to_float(raw.get("last_seen_seconds")) or 0.0,
+            latency_ms=_to_float(raw.get("latency_ms")),
+            jitter_ms=_to_float(raw.get("jitter_ms")),
+            is_self=username == self._username,
+        )
 
     def _normalize_time_limit(self, raw: Optional[Dict[str, object]]) -> Optional[Dict[str, object]]:
         if not isinstance(raw, dict):
@@ -387,32 +886,12 @@ class ClientApp:
             "is_active": bool(raw.get("is_active", False)),
             "is_expired": bool(raw.get("is_expired", False)),
         }
-        for field in ("duration_seconds", "remaining_seconds"):
-            value = raw.get(field)
-            if value is None:
-                status[field] = None
-            else:
-                try:
-                    status[field] = int(value)
-                except (TypeError, ValueError):
-                    status[field] = None
-        for field in ("end_timestamp", "started_at", "updated_at"):
-            value = raw.get(field)
-            if value is None:
-                status[field] = None
-            else:
-                try:
-                    status[field] = float(value)
-                except (TypeError, ValueError):
-                    status[field] = None
-        progress = raw.get("progress")
-        if progress is None:
-            status["progress"] = None
-        else:
-            try:
-                status["progress"] = max(0.0, min(1.0, float(progress)))
-            except (TypeError, ValueError):
-                status["progress"] = None
+        for key in ("duration_seconds", "remaining_seconds"):
+            status[key] = _to_int(raw.get(key))
+        for key in ("end_timestamp", "started_at", "updated_at"):
+            status[key] = _to_float(raw.get(key))
+        progress = _to_float(raw.get("progress"))
+        status["progress"] = max(0.0, min(1.0, progress)) if progress is not None else None
         return status
 
     def _normalize_admin_notice(self, raw: Dict[str, object]) -> Optional[Dict[str, object]]:
@@ -426,73 +905,85 @@ class ClientApp:
             "level": str(raw.get("level", "info")).lower(),
             "actor": str(raw.get("actor", "admin")) or "admin",
         }
-        timestamp = raw.get("timestamp")
-        try:
-            notice["timestamp"] = float(timestamp) if timestamp is not None else time.time()
-        except (TypeError, ValueError):
-            notice["timestamp"] = time.time()
+        timestamp = _to_float(raw.get("timestamp"))
+        notice["timestamp"] = timestamp if timestamp is not None else time.time()
         return notice
 
-    def _presence_values(self) -> List[Dict[str, object]]:
-        return [dict(value) for value in self._presence.values()]
+    def _presence_values(self) -> List[PresenceEntry]:
+        """Return the live presence entries; callers serialise them before yielding."""
+        return list(self._presence.values())
 
-    async def _broadcast_presence_sync(self) -> None:
-        await self._ws_hub.broadcast(
-            {
-                "type": "presence_sync",
-                "payload": {
-                    "participants": self._presence_values(),
-                },
-            }
-        )
+    def _mark_presence_dirty(self, username: str) -> None:
+        """Queue a presence change; bursts within the flush window share one broadcast."""
+        self._dirty_presence.add(username)
+        if self._presence_flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._presence_flush_handle = loop.call_later(
+                PRESENCE_FLUSH_DELAY_SECONDS, self._flush_presence
+            )
 
-    async def _broadcast_presence_update(self, entry: Dict[str, object]) -> None:
-        await self._ws_hub.broadcast(
-            {
-                "type": "presence_update",
-                "payload": dict(entry),
-            }
-        )
+    def _flush_presence(self) -> None:
+        self._presence_flush_handle = None
+        dirty = self._dirty_presence
+        updates = [entry for entry in map(self._presence.get, dirty) if entry is not None]
+        dirty.clear()
+        if not updates:
+            return
+        # Encoded and queued now, so a presence_sync sent after this flush can never
+        # be overtaken by the older batch.
+        text = encode_ui_message({"type": "presence_batch", "payload": {"updates": updates}})
+        self._broadcast_text(text)
+
+    def _cancel_presence_flush(self) -> None:
+        if self._presence_flush_handle is not None:
+            self._presence_flush_handle.cancel()
+            self._presence_flush_handle = None
+        self._dirty_presence.clear()
 
-    async def _determine_upload_size(self, upload: UploadFile) -> int:
-        """Return the size in bytes of an incoming UploadFile without consuming it."""
+    async def _broadcast_presence_sync(self) -> None:
+        # A full sync supersedes any queued per-entry changes.
+        self._cancel_presence_flush()
+        # Hashing the field values is far cheaper than re-encoding the roster, and the
+        # roster is usually unchanged between syncs.
+        key = tuple(entry.as_tuple() for entry in self._presence.values())
+        cached = self._presence_sync_cache
+        if cached is not None and cached[0] == key:
+            text = cached[1]
+        else:
+            text = encode_ui_message(
+                {
+                    "type": "presence_sync",
+                    "payload": {
+                        "participants": self._presence_values(),
+                    },
+                }
+            )
+            self._presence_sync_cache = (key, text)
+        self._broadcast_text(text)
+
+    def _declared_upload_size(self, request: Request) -> int:
+        """Return the upload size announced in Content-Length; the file server needs it up front."""
         try:
-            upload.file.seek(0, os.SEEK_END)
-            size = int(upload.file.tell())
-            upload.file.seek(0)
-            return size
-        except (AttributeError, OSError, ValueError):
-            size = 0
-            chunk_size = 1024 * 1024
-            while True:
-                chunk = await upload.read(chunk_size)
-                if not chunk:
-                    break
-                size += len(chunk)
-                if size > MAX_UPLOAD_SIZE_BYTES:
-                    break
-            await upload.seek(0)
-            return size
+            size = int(request.headers["content-length"])
+        except (KeyError, ValueError):
+            raise HTTPException(status_code=411, detail="Length required") from None
+        if size < 0:
+            raise HTTPException(status_code=400, detail="Invalid Content-Length")
+        return size
 
     def _sanitize_filename(self, filename: str) -> str:
         """Ensure filenames used in headers contain only ASCII-safe characters."""
         if not filename:
             return "download.bin"
-        safe_chars = []
-        for ch in filename:
-            code = ord(ch)
-            if 32 <= code < 127 and ch not in {'\\', '"'}:
-                safe_chars.append(ch)
-            else:
-                safe_chars.append("_")
-        sanitized = "".join(safe_chars).strip()
+        raw = filename.encode("ascii", _FILENAME_ERRORS)
+        sanitized = raw.translate(_SAFE_FILENAME_TABLE).decode("ascii").strip()
         return sanitized or "download.bin"
 
     async def _start_latency_probe(self) -> None:
         if self._username is None:
             await self._stop_latency_probe()
             return
-        port_value = self._media_config.get("latency_port")
+        port_value = self._latency_port
         if not port_value:
             await self._stop_latency_probe()
             return
@@ -520,6 +1011,7 @@ class ClientApp:
         self._latency_probe = probe
         self._latency_probe_port = port
 
+    @_invalidates_snapshot
     async def _stop_latency_probe(self) -> None:
         if self._latency_probe is None:
             return
@@ -530,6 +1022,7 @@ class ClientApp:
             self._latency_probe_port = None
             self._own_latency = None
 
+    @_invalidates_snapshot
     async def _on_latency_metrics(self, latency_ms: float, jitter_ms: Optional[float]) -> None:
         self._own_latency = {
             "latency_ms": latency_ms,
@@ -537,25 +1030,51 @@ class ClientApp:
         }
         if self._username:
             entry = self._presence.get(self._username)
-            if entry is not None:
-                entry["latency_ms"] = latency_ms
-                entry["jitter_ms"] = jitter_ms
-                await self._broadcast_presence_update(entry)
-        await self._ws_hub.broadcast(
-            {
-                "type": "latency_metrics",
-                "payload": {
-                    "latency_ms": latency_ms,
-                    "jitter_ms": jitter_ms,
-                },
-            }
-        )
+            if entry is not None and (
+                _latency_moved(entry.latency_ms, latency_ms)
+                or _latency_moved(entry.jitter_ms, jitter_ms)
+            ):
+                entry.latency_ms = latency_ms
+                entry.jitter_ms = jitter_ms
+                self._mark_presence_dirty(self._username)
+        if self._latency_metrics_handle is None:
+            loop = asyncio.get_running_loop()
+            delay = (
+                self._latency_metrics_sent_at + LATENCY_METRICS_MIN_INTERVAL_SECONDS - loop.time()
+            )
+            if delay > 0:
+                # The trailing send picks up whatever the latest sample is by then.
+                self._latency_metrics_handle = loop.call_later(delay, self._flush_latency_metrics)
+            else:
+                self._latency_metrics_sent_at = loop.time()
+                self._broadcast(
+                    {
+                        "type": "latency_metrics",
+                        "payload": {
+                            "latency_ms": latency_ms,
+                            "jitter_ms": jitter_ms,
+                        },
+                    }
+                )
         if self._client and self._connected:
             try:
                 await self._client.send_latency_update(latency_ms, jitter_ms)
             except Exception:
                 logger.debug("Latency update send failed", exc_info=True)
 
+    def _flush_latency_metrics(self) -> None:
+        self._latency_metrics_handle = None
+        latency = self._own_latency
+        if latency is None:
+            return
+        self._latency_metrics_sent_at = asyncio.get_running_loop().time()
+        self._broadcast({"type": "latency_metrics", "payload": dict(latency)})
+
+    def _cancel_latency_metrics_flush(self) -> None:
+        if self._latency_metrics_handle is not None:
+            self._latency_metrics_handle.cancel()
+            self._latency_metrics_handle = None
+
     def _cancel_reconnect(self) -> None:
         if self._reconnect_task is None:
             return
@@ -596,6 +1115,7 @@ class ClientApp:
 
         self._reconnect_task = asyncio.create_task(_worker(delay))
 
+    @_invalidates_snapshot
     async def _on_control_disconnect(self, reason: Optional[str]) -> None:
         if not self._should_reconnect:
             return
@@ -615,26 +1135,10 @@ class ClientApp:
         self._schedule_reconnect()
 
     def _generate_username(self) -> str:
-        adjectives = [
-            "swift",
-            "bright",
-            "lively",
-            "bold",
-            "stellar",
-            "brisk",
-            "clever",
-        ]
-        nouns = [
-            "lynx",
-            "sparrow",
-            "otter",
-            "falcon",
-            "fox",
-            "orca",
-            "aurora",
-        ]
-        return f"{random.choice(adjectives)}-{random.choice(nouns)}-{random.randint(100, 999)}"
+        adjective, noun = random.choice(_USERNAME_PAIRS)
+        return f"{adjective}-{noun}-{random.randrange(100, 1000)}"
 
+    @_invalidates_snapshot
     async def _start_session(self, username: str) -> None:
         if self._kicked:
             await self._broadcast_session_status(
@@ -664,11 +1168,13 @@ class ClientApp:
             pre_shared_key=self._pre_shared_key,
             on_disconnect=self._on_control_disconnect,
         )
-        self._file_client = FileClient(host=self._server_host, port=self._media_config["file_port"], username=username)
+        self._file_client = FileClient(
+            host=self._server_host, port=self._file_port, username=username
+        )
         self._screen_publisher = ScreenPublisher(
             username=username,
             server_host=self._server_host,
-            port=self._media_config["screen_port"],
+            port=self._screen_port,
         )
         self._audio_enabled = False
         self._video_enabled = False
@@ -680,19 +1186,14 @@ class ClientApp:
                 "video_enabled": self._video_enabled,
             }
         }
-        self._presence[username] = {
-            "username": username,
-            "audio_enabled": self._audio_enabled,
-            "video_enabled": self._video_enabled,
-            "hand_raised": self._local_hand_raised,
-            "is_typing": False,
-            "is_presenter": False,
-            "latency_ms": None,
-            "jitter_ms": None,
-            "last_seen_seconds": 0.0,
-            "is_self": True,
-        }
-        await self._broadcast_presence_update(self._presence[username])
+        self._presence[username] = PresenceEntry(
+            username=username,
+            audio_enabled=self._audio_enabled,
+            video_enabled=self._video_enabled,
+            hand_raised=self._local_hand_raised,
+            is_self=True,
+        )
+        self._mark_presence_dirty(username)
         try:
             await self._client.connect()
             self._connected = True
@@ -721,16 +1222,17 @@ class ClientApp:
             self._schedule_reconnect()
             return
 
+    @_invalidates_snapshot
     async def _stop_media_clients(self) -> None:
-        tasks: List[asyncio.Future[None]] = []
-        if self._video_client:
-            tasks.append(asyncio.create_task(self._video_client.stop()))
-        if self._audio_client:
-            tasks.append(asyncio.create_task(self._audio_client.stop()))
-        if self._screen_publisher:
-            tasks.append(asyncio.create_task(self._screen_publisher.stop()))
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        # Idle clients are skipped outright. gather rather than TaskGroup: one failing
+        # stop() must not cancel the others, and 3.10 has no TaskGroup anyway.
+        stops = [
+            client.stop()
+            for client in (self._video_client, self._audio_client, self._screen_publisher)
+            if client is not None and client.is_running
+        ]
+        if stops:
+            await asyncio.gather(*stops, return_exceptions=True)
         self._video_client = None
         self._audio_client = None
         self._screen_publisher = None
@@ -747,59 +1249,53 @@ class ClientApp:
         server.should_exit = True
         await asyncio.sleep(0)
 
-    async def _broadcast_session_status(self, state: str, **payload: object) -> None:
-        payload_data = dict(payload)
-        payload_data.setdefault("username", self._username or self._prefill_username)
-        await self._ws_hub.broadcast(
-            {
-                "type": "session_status",
-                "payload": {
-                    "state": state,
-                    **payload_data,
-                },
-            }
-        )
+    async def _broadcast_session_status(
+        self,
+        state: str,
+        *,
+        username: Optional[str] = _DEFAULT_USERNAME,
+        message: Optional[str] = None,
+    ) -> None:
+        if username is _DEFAULT_USERNAME:
+            username = self._username or self._prefill_username
+        self._broadcast_text(_session_status_text(state, username, message))
 
     def _build_snapshot(self) -> Dict[str, object]:
-        files = [dict(file) for file in self._file_catalog.values()]
-        chat_history = [dict(message) for message in self._chat_history]
+        """Assemble the UI state; it shares live objects, so encode it before yielding."""
         return {
             "connected": self._connected,
             "username": self._username,
-            "peers": list(self._peers),
-            "chat_history": chat_history,
-            "files": files,
+            "peers": self._peers,
+            "chat_history": list(self._chat_history),
+            "files": list(self._file_catalog.values()),
             "presenter": self._presenter,
             "media": {
                 "audio_enabled": self._audio_enabled,
                 "video_enabled": self._video_enabled,
                 "screen_requested": self._screen_requested,
             },
-            "peer_media": {
-                peer: dict(state) for peer, state in self._peer_media.items()
-            },
+            "peer_media": self._peer_media,
             "presence": self._presence_values(),
-            "latency": dict(self._own_latency) if self._own_latency else None,
+            "latency": self._own_latency or None,
             "hand_raised": self._local_hand_raised,
-            "reactions": [dict(item) for item in self._reaction_log[-50:]],
-            "time_limit": dict(self._time_limit) if self._time_limit else None,
-            "admin_notices": [dict(item) for item in self._admin_notices[-20:]],
+            "reactions": _tail(self._reaction_log, 50),
+            "time_limit": self._time_limit or None,
+            "admin_notices": _tail(self._admin_notices, 20),
         }
 
+    def _snapshot_message(self) -> str:
+        """Return the encoded state_snapshot frame, rebuilding it only after state changed."""
+        text = self._snapshot_text
+        if text is None:
+            text = encode_ui_message({"type": "state_snapshot", "payload": self._build_snapshot()})
+            self._snapshot_text = text
+        return text
+
     def _cancel_time_limit_watch(self) -> None:
-        task = self._time_limit_expiry_task
-        if task is None:
+        if self._time_limit_deadline is None:
             return
-        try:
-            current = asyncio.current_task()
-        except RuntimeError:
-            current = None
-        if task is current:
-            self._time_limit_expiry_task = None
-            return
-        if not task.done():
-            task.cancel()
-        self._time_limit_expiry_task = None
+        self._time_limit_deadline = None
+        self._time_limit_event.set()
 
     def _compute_time_limit_delay(self, status: Optional[Dict[str, object]]) -> Optional[float]:
         if not status or not status.get("is_active"):
@@ -823,34 +1319,50 @@ class ClientApp:
             self._time_limit_exit_triggered = False
             return
         delay = self._compute_time_limit_delay(status)
-        is_expired = bool(status.get("is_expired"))
-        if is_expired or (delay is not None and delay <= 0.0):
-            try:
-                loop = asyncio.get_running_loop()
-            except RuntimeError:
-                return
-            task = loop.create_task(self._handle_time_limit_expired())
-            task.add_done_callback(lambda _: setattr(self, "_time_limit_expiry_task", None))
-            self._time_limit_expiry_task = task
-            return
-        if delay is None:
+        if status.get("is_expired"):
+            delay = 0.0
+        elif delay is None:
             return
-        self._time_limit_exit_triggered = False
-
-        async def _wait_and_leave() -> None:
-            try:
-                await asyncio.sleep(delay)
-                await self._handle_time_limit_expired()
-            except asyncio.CancelledError:
-                return
-
+        elif delay > 0.0:
+            self._time_limit_exit_triggered = False
         try:
             loop = asyncio.get_running_loop()
         except RuntimeError:
             return
-        task = loop.create_task(_wait_and_leave())
-        task.add_done_callback(lambda _: setattr(self, "_time_limit_expiry_task", None))
-        self._time_limit_expiry_task = task
+        # Server timestamps are wall-clock; they are converted to a delay exactly once.
+        self._time_limit_deadline = loop.time() + delay
+        self._time_limit_event.set()
+        task = self._time_limit_watcher_task
+        if task is None or task.done():
+            self._time_limit_watcher_task = loop.create_task(self._time_limit_watcher())
+
+    async def _time_limit_watcher(self) -> None:
+        event = self._time_limit_event
+        loop = asyncio.get_running_loop()
+        while True:
+            deadline = self._time_limit_deadline
+            if deadline is None:
+                await event.wait()
+                event.clear()
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0.0:
+                self._time_limit_deadline = None
+                try:
+                    await self._handle_time_limit_expired()
+                except Exception:
+                    logger.exception("Failed to leave after the meeting time limit")
+                continue
+            try:
+                if _HAS_ASYNCIO_TIMEOUT:
+                    # A single timer handle; wait_for would wrap the wait in a new task.
+                    async with asyncio.timeout(remaining):
+                        await event.wait()
+                else:
+                    await asyncio.wait_for(event.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                continue
+            event.clear()
 
     async def _handle_time_limit_expired(self) -> None:
         if self._time_limit_exit_triggered:
@@ -872,21 +1384,26 @@ class ClientApp:
             self._video_client.set_capture_enabled(enabled)
         self._update_local_media_state(video_enabled=enabled)
 
+    def _peer_media_entry(
+        self, username: str, *, audio_enabled: bool = False, video_enabled: bool = False
+    ) -> Dict[str, bool]:
+        """Return the media state for ``username``, creating it only when missing."""
+        entry = self._peer_media.get(username)
+        if entry is None:
+            entry = {"audio_enabled": audio_enabled, "video_enabled": video_enabled}
+            self._peer_media[username] = entry
+        return entry
+
     def _update_local_media_state(
         self,
         *,
         audio_enabled: Optional[bool] = None,
         video_enabled: Optional[bool] = None,
     ) -> None:
+        self._snapshot_text = None
         if self._username is None:
             return
-        entry = self._peer_media.setdefault(
-            self._username,
-            {
-                "audio_enabled": False,
-                "video_enabled": False,
-            },
-        )
+        entry = self._peer_media_entry(self._username)
         if audio_enabled is not None:
             entry["audio_enabled"] = audio_enabled
         if video_enabled is not None:
@@ -894,467 +1411,579 @@ class ClientApp:
         presence_entry = self._presence.get(self._username)
         if presence_entry is not None:
             if audio_enabled is not None:
-                presence_entry["audio_enabled"] = audio_enabled
+                presence_entry.audio_enabled = audio_enabled
             if video_enabled is not None:
-                presence_entry["video_enabled"] = video_enabled
-            asyncio.create_task(self._broadcast_presence_update(presence_entry))
-
-    async def run(self, host: str = "127.0.0.1", port: int = 8100) -> None:
-        import uvicorn
+                presence_entry.video_enabled = video_enabled
+            self._mark_presence_dirty(self._username)
 
-        config = uvicorn.Config(self._app, host=host, port=port, log_level="info")
+    async def run(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8100,
+        *,
+        sock: Optional[socket.socket] = None,
+        open_browser: bool = True,
+    ) -> None:
+        """Serve the web UI; ``sock`` is an optional pre-bound listening socket."""
+        # serve() runs on the caller's loop (uvloop when available, see client.__main__),
+        # so ``loop`` would be ignored here; httptools parses HTTP in C. The app has no
+        # lifespan handlers, and per-request access lines add nothing for a local UI.
+        config = uvicorn.Config(
+            self._app,
+            host=host,
+            port=port,
+            log_level="info",
+            http="httptools",
+            ws_ping_interval=UI_WS_PING_INTERVAL_SECONDS,
+            ws_ping_timeout=UI_WS_PING_INTERVAL_SECONDS,
+            lifespan="off",
+            access_log=False,
+        )
         server = uvicorn.Server(config)
         self._uvicorn_server = server
-        url = f"http://{host}:{port}" if host != "0.0.0.0" else f"http://127.0.0.1:{port}"
-        webbrowser.open_new_tab(url)
+        if open_browser:
+            url = f"http://{host}:{port}" if host != "0.0.0.0" else f"http://127.0.0.1:{port}"
+            # Launching the browser may fork xdg-open; keep it off the loop so serve()
+            # starts accepting connections straight away.
+            launch = asyncio.get_running_loop().run_in_executor(
+                None, webbrowser.open_new_tab, url
+            )
+            launch.add_done_callback(_log_browser_launch_failure)
 
         self._connected = False
         await self._broadcast_session_status("idle")
         try:
-            await server.serve()
+            await server.serve(sockets=[sock] if sock is not None else None)
         finally:
             self._uvicorn_server = None
             self._kicked = False
             self._kick_reason = None
+            watcher = self._time_limit_watcher_task
+            if watcher is not None:
+                watcher.cancel()
+                self._time_limit_watcher_task = None
 
+    @_invalidates_snapshot
     async def _handle_control_message(self, action: ControlAction, payload: Dict[str, object]) -> None:
         logger.debug("Control action %s payload %s", action, payload)
-        if action == ControlAction.PRESENTER_GRANTED:
-            username = payload.get("username")
-            if username == self._username:
-                self._screen_requested = True
-                if self._screen_publisher:
-                    await self._screen_publisher.start()
-            else:
-                self._screen_requested = False
-            self._presenter = username
-        elif action == ControlAction.PRESENTER_REVOKED:
-            username = payload.get("username")
-            if username == self._username:
-                self._screen_requested = False
-                if self._screen_publisher:
-                    await self._screen_publisher.stop()
-            if self._presenter == username:
-                self._presenter = None
-
-        if action == ControlAction.WELCOME:
-            media = payload.get("media") or {}
-            await self._ensure_media_clients(media)
-            peers = payload.get("peers", [])
-            self._peers = [peer for peer in peers if isinstance(peer, str)]
-            if self._video_client:
-                self._video_client.update_peers(self._peers)
-            chat_history = payload.get("chat_history") or []
-            self._chat_history = [dict(message) for message in chat_history if isinstance(message, dict)]
-            files = payload.get("files") or []
-            self._file_catalog = {}
-            for file in files:
-                if isinstance(file, dict) and file.get("file_id"):
-                    file_copy = dict(file)
-                    self._file_catalog[file_copy["file_id"]] = file_copy
-            self._presenter = payload.get("presenter")
-            raw_media_state = payload.get("media_state")
-            media_state = raw_media_state if isinstance(raw_media_state, dict) else {}
-            refreshed_peer_media: dict[str, dict[str, bool]] = {}
-            for peer, state in media_state.items():
-                if isinstance(peer, str) and isinstance(state, dict):
-                    refreshed_peer_media[peer] = {
-                        "audio_enabled": bool(state.get("audio_enabled")),
-                        "video_enabled": bool(state.get("video_enabled")),
-                    }
-            if self._username:
-                refreshed_peer_media.setdefault(
-                    self._username,
-                    {
-                        "audio_enabled": self._audio_enabled,
-                        "video_enabled": self._video_enabled,
-                    },
-                )
-            self._peer_media = refreshed_peer_media
-            for peer in self._peers:
-                if isinstance(peer, str):
-                    self._peer_media.setdefault(
-                        peer,
-                        {
-                            "audio_enabled": False,
-                            "video_enabled": False,
-                        },
-                    )
-            presence_items = payload.get("presence") or []
-            if isinstance(presence_items, list):
-                self._presence.clear()
-                for item in presence_items:
-                    if isinstance(item, dict):
-                        normalized = self._normalize_presence_entry(item)
-                        if normalized:
-                            self._presence[normalized["username"]] = normalized
-            time_limit_payload = self._normalize_time_limit(payload.get("time_limit"))
-            self._time_limit = time_limit_payload
-            payload["time_limit"] = time_limit_payload
-            self._schedule_time_limit_watch(time_limit_payload)
-            if self._admin_notices:
-                payload["admin_notices"] = [dict(item) for item in self._admin_notices[-10:]]
-            if self._username:
-                entry = self._presence.get(self._username)
-                if entry is None:
-                    entry = self._normalize_presence_entry({"username": self._username}) or {
-                        "username": self._username,
-                        "audio_enabled": self._audio_enabled,
-                        "video_enabled": self._video_enabled,
-                        "hand_raised": self._local_hand_raised,
-                        "is_typing": False,
-                        "is_presenter": False,
-                        "latency_ms": None,
-                        "jitter_ms": None,
-                        "last_seen_seconds": 0.0,
-                        "is_self": True,
-                    }
-                    self._presence[self._username] = entry
-                entry["audio_enabled"] = self._audio_enabled
-                entry["video_enabled"] = self._video_enabled
-                entry["hand_raised"] = self._local_hand_raised
-                entry["is_self"] = True
-                if entry.get("latency_ms") is not None:
-                    self._own_latency = {
-                        "latency_ms": float(entry["latency_ms"]),
-                        "jitter_ms": entry.get("jitter_ms"),
-                    }
-            await self._broadcast_presence_sync()
-            await self._start_latency_probe()
-        elif action == ControlAction.USER_JOINED:
-            username = payload.get("username")
-            participants = payload.get("participants")
-            if isinstance(participants, list):
-                self._peers = [peer for peer in participants if isinstance(peer, str)]
-            elif username and username not in self._peers:
-                self._peers.append(username)
-            if self._video_client:
-                self._video_client.update_peers(self._peers)
-            if self._username:
-                self._peer_media.setdefault(
-                    self._username,
-                    {
-                        "audio_enabled": self._audio_enabled,
-                        "video_enabled": self._video_enabled,
-                    },
-                )
-            if isinstance(username, str):
-                self._peer_media.setdefault(
-                    username,
-                    {
-                        "audio_enabled": False,
-                        "video_enabled": False,
-                    },
-                )
-        elif action == ControlAction.USER_LEFT:
-            username = payload.get("username")
-            participants = payload.get("participants")
-            if isinstance(participants, list):
-                self._peers = [peer for peer in participants if isinstance(peer, str)]
-            elif username and username in self._peers:
-                self._peers = [peer for peer in self._peers if peer != username]
-            if self._video_client:
-                self._video_client.update_peers(self._peers)
-            if self._presenter == username:
-                self._presenter = None
-            if self._username:
-                self._peer_media.setdefault(
-                    self._username,
-                    {
-                        "audio_enabled": self._audio_enabled,
-                        "video_enabled": self._video_enabled,
-                    },
-                )
-            if isinstance(username, str):
-                self._peer_media.pop(username, None)
-                self._presence.pop(username, None)
-                await self._broadcast_presence_sync()
-        elif action == ControlAction.CHAT_MESSAGE:
-            message = {
-                "sender": payload.get("sender"),
-                "message": payload.get("message"),
-                "timestamp_ms": payload.get("timestamp_ms"),
-            }
-            # Preserve recipients if present (for UI rendering and local snapshot)
-            if isinstance(payload.get("recipients"), list):
-                message["recipients"] = [
-                    str(x).strip() for x in payload.get("recipients") if isinstance(x, str) and str(x).strip()
-                ]
-            self._chat_history.append(message)
-            if len(self._chat_history) > 200:
-                self._chat_history.pop(0)
-        elif action == ControlAction.FILE_OFFER:
-            if payload.get("files"):
-                for file in payload["files"]:
-                    if isinstance(file, dict) and file.get("file_id"):
-                        file_copy = dict(file)
-                        self._file_catalog[file_copy["file_id"]] = file_copy
-            elif payload.get("file_id"):
-                file_copy = dict(payload)
-                self._file_catalog[file_copy["file_id"]] = file_copy
-        elif action == ControlAction.VIDEO_STATUS:
-            username = payload.get("username")
-            if isinstance(username, str):
-                entry = self._peer_media.setdefault(
-                    username,
-                    {
-                        "audio_enabled": False,
-                        "video_enabled": False,
-                    },
-                )
-                if "audio_enabled" in payload:
-                    entry["audio_enabled"] = bool(payload.get("audio_enabled"))
-                if "video_enabled" in payload:
-                    entry["video_enabled"] = bool(payload.get("video_enabled"))
-                if username == self._username and "video_enabled" in payload:
-                    self._video_enabled = bool(payload.get("video_enabled"))
-        elif action == ControlAction.AUDIO_STATUS:
-            username = payload.get("username")
-            if isinstance(username, str):
-                entry = self._peer_media.setdefault(
-                    username,
-                    {
-                        "audio_enabled": False,
-                        "video_enabled": False,
-                    },
-                )
-                if "audio_enabled" in payload:
-                    entry["audio_enabled"] = bool(payload.get("audio_enabled"))
-                if username == self._username and "audio_enabled" in payload:
-                    self._audio_enabled = bool(payload.get("audio_enabled"))
-                presence_entry = self._presence.get(username)
-                if presence_entry is not None and "audio_enabled" in payload:
-                    presence_entry["audio_enabled"] = bool(payload.get("audio_enabled"))
-                    await self._broadcast_presence_update(presence_entry)
-        elif action == ControlAction.KICKED:
-            reason = str(payload.get("reason") or "An administrator removed you from this meeting.")
-            self._kicked = True
-            self._kick_reason = reason
-            self._connected = False
-            await self._stop_media_clients()
-            if self._client:
-                await self._client.close()
-            self._client = None
-            self._file_client = None
-            self._screen_publisher = None
-            self._peers = []
-            self._chat_history.clear()
-            self._file_catalog.clear()
-            self._peer_media.clear()
+        handler = self._control_handlers.get(action)
+        if handler is not None:
+            # A handler may return a normalised payload to relay in place of the raw one.
+            replacement = await handler(payload)
+            if replacement is not None:
+                payload = replacement
+
+        # With no tab open the frame would go nowhere; a later tab gets a snapshot.
+        if self._ws_hub.has_connections:
+            self._queue_ui_frame({"type": _ACTION_VALUES[action], "payload": payload})
+
+    def _queue_ui_frame(self, message: Dict[str, object]) -> None:
+        """Queue a relayed frame; frames queued in the same loop tick share one send."""
+        self._outgoing_frames.append(message)
+        if self._outgoing_flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._outgoing_flush_handle = loop.call_soon(self._flush_ui_frames)
+
+    def _broadcast(self, message: Dict[str, object]) -> None:
+        """Encode ``message`` and queue it for every UI tab."""
+        if self._ws_hub.has_connections:
+            self._broadcast_text(encode_ui_message(message))
+
+    def _broadcast_text(self, text: str) -> None:
+        """Queue encoded ``text`` for every UI tab, behind frames relayed earlier this tick."""
+        if self._outgoing_flush_handle is not None:
+            self._outgoing_flush_handle.cancel()
+            self._flush_ui_frames()
+        self._ws_hub.broadcast_text(text)
+
+    def _flush_ui_frames(self) -> None:
+        self._outgoing_flush_handle = None
+        frames = self._outgoing_frames
+        if not frames:
+            return
+        self._outgoing_frames = []
+        # A lone frame goes out unwrapped; only real bursts pay for the envelope.
+        if len(frames) == 1:
+            message = frames[0]
+        else:
+            message = {"type": "batch", "payload": {"frames": frames}}
+        # Queued in this callback rather than a task, keeping relayed frames in order
+        # with everything else the hub sends.
+        self._ws_hub.broadcast_text(encode_ui_message(message))
+
+    async def _on_presenter_granted(
+        self, payload: Dict[str, object]
+    ) -> Optional[Dict[str, object]]:
+        username = payload.get("username")
+        if username == self._username:
+            self._screen_requested = True
+            if self._screen_publisher:
+                await self._screen_publisher.start()
+        else:
+            self._screen_requested = False
+        self._presenter = username
+
+    async def _on_presenter_revoked(
+        self, payload: Dict[str, object]
+    ) -> Optional[Dict[str, object]]:
+        username = payload.get("username")
+        if username == self._username:
+            self._screen_requested = False
+            if self._screen_publisher:
+                await self._screen_publisher.stop()
+        if self._presenter == username:
             self._presenter = None
-            self._cancel_time_limit_watch()
-            self._time_limit_exit_triggered = False
-            self._time_limit = None
-            await self._broadcast_session_status("kicked", message=reason)
-            await self._stop_ui_server()
-        elif action == ControlAction.PRESENCE_SYNC:
-            participants = payload.get("participants")
-            if isinstance(participants, list):
-                self._presence.clear()
-                for item in participants:
-                    if isinstance(item, dict):
-                        normalized = self._normalize_presence_entry(item)
-                        if normalized:
-                            self._presence[normalized["username"]] = normalized
-                await self._broadcast_presence_sync()
-        elif action == ControlAction.PRESENCE_UPDATE:
-            normalized = self._normalize_presence_entry(payload)
-            if normalized:
-                self._presence[normalized["username"]] = normalized
-                if normalized["username"] == self._username:
-                    self._local_hand_raised = bool(normalized.get("hand_raised", False))
-                    latency_ms = normalized.get("latency_ms")
-                    if latency_ms is not None:
-                        self._own_latency = {
-                            "latency_ms": float(latency_ms),
-                            "jitter_ms": normalized.get("jitter_ms"),
-                        }
-                await self._broadcast_presence_update(normalized)
-        elif action == ControlAction.TYPING_STATUS:
-            username = payload.get("username")
-            is_typing = bool(payload.get("is_typing", False))
-            entry = self._presence.get(username) if isinstance(username, str) else None
-            if entry is not None:
-                entry["is_typing"] = is_typing
-                await self._broadcast_presence_update(entry)
-        elif action == ControlAction.HAND_STATUS:
-            username = payload.get("username")
-            hand_raised = bool(payload.get("hand_raised", False))
-            entry = self._presence.get(username) if isinstance(username, str) else None
-            if entry is not None:
-                entry["hand_raised"] = hand_raised
-                if username == self._username:
-                    self._local_hand_raised = hand_raised
-                await self._broadcast_presence_update(entry)
-        elif action == ControlAction.REACTION:
-            reaction = {
-                "username": payload.get("username"),
-                "reaction": payload.get("reaction"),
-                "timestamp_ms": payload.get("timestamp_ms"),
+
+    @staticmethod
+    def _coerce_string_list(items: object) -> List[str]:
+        """Keep only the string entries of a participant list from the server."""
+        if not isinstance(items, list):
+            return []
+        return [item for item in items if type(item) is str]
+
+    def _set_peers(self, peers: List[str]) -> None:
+        self._peers = peers
+        self._peer_set = set(peers)
+
+    async def _on_welcome(self, payload: Dict[str, object]) -> Optional[Dict[str, object]]:
+        media = payload.get("media") or {}
+        await self._ensure_media_clients(media)
+        self._set_peers(self._coerce_string_list(payload.get("peers")))
+        if self._video_client:
+            self._video_client.update_peers(self._peers)
+        chat_history = payload.get("chat_history") or []
+        self._chat_history = deque(
+            (message for message in chat_history if isinstance(message, dict)),
+            maxlen=CHAT_HISTORY_LIMIT,
+        )
+        files = payload.get("files") or []
+        self._file_catalog = OrderedDict(
+            (file["file_id"], file)
+            for file in files
+            if isinstance(file, dict) and file.get("file_id")
+        )
+        self._trim_file_catalog()
+        self._presenter = payload.get("presenter")
+        raw_media_state = payload.get("media_state")
+        media_state = raw_media_state if isinstance(raw_media_state, dict) else {}
+        # Built in precedence order: peer defaults, then our local state, then the
+        # server's reported media_state, which overrides both.
+        peer_media: Dict[str, Dict[str, bool]] = {
+            peer: {"audio_enabled": False, "video_enabled": False} for peer in self._peers
+        }
+        if self._username:
+            peer_media[self._username] = {
+                "audio_enabled": self._audio_enabled,
+                "video_enabled": self._video_enabled,
             }
-            self._reaction_log.append(reaction)
-            if len(self._reaction_log) > 200:
-                self._reaction_log.pop(0)
-        elif action == ControlAction.LATENCY_UPDATE:
-            username = payload.get("username")
-            entry = self._presence.get(username) if isinstance(username, str) else None
-            if entry is not None:
-                entry["latency_ms"] = payload.get("latency_ms")
-                entry["jitter_ms"] = payload.get("jitter_ms")
-                if username == self._username:
+        peer_media.update(
+            (
+                peer,
+                {
+                    "audio_enabled": bool(state.get("audio_enabled")),
+                    "video_enabled": bool(state.get("video_enabled")),
+                },
+            )
+            for peer, state in media_state.items()
+            if isinstance(peer, str) and isinstance(state, dict)
+        )
+        self._peer_media = peer_media
+        presence_items = payload.get("presence") or []
+        if isinstance(presence_items, list):
+            self._presence.clear()
+            for item in presence_items:
+                if isinstance(item, dict):
+                    normalized = self._normalize_presence_entry(item)
+                    if normalized:
+                        self._presence[normalized.username] = normalized
+        time_limit_payload = self._normalize_time_limit(payload.get("time_limit"))
+        self._time_limit = time_limit_payload
+        payload["time_limit"] = time_limit_payload
+        self._schedule_time_limit_watch(time_limit_payload)
+        if self._admin_notices:
+            payload["admin_notices"] = _tail(self._admin_notices, 10)
+        if self._username:
+            entry = self._presence.get(self._username)
+            if entry is None:
+                entry = PresenceEntry(username=self._username)
+                self._presence[self._username] = entry
+            entry.audio_enabled = self._audio_enabled
+            entry.video_enabled = self._video_enabled
+            entry.hand_raised = self._local_hand_raised
+            entry.is_self = True
+            if entry.latency_ms is not None:
+                self._own_latency = {
+                    "latency_ms": entry.latency_ms,
+                    "jitter_ms": entry.jitter_ms,
+                }
+        await self._broadcast_presence_sync()
+        await self._start_latency_probe()
+
+    async def _on_user_joined(self, payload: Dict[str, object]) -> Optional[Dict[str, object]]:
+        username = payload.get("username")
+        participants = payload.get("participants")
+        if isinstance(participants, list):
+            self._set_peers(self._coerce_string_list(participants))
+        elif isinstance(username, str) and username and username not in self._peer_set:
+            self._peers.append(username)
+            self._peer_set.add(username)
+        if self._video_client:
+            self._video_client.update_peers(self._peers)
+        if self._username:
+            self._peer_media_entry(
+                self._username,
+                audio_enabled=self._audio_enabled,
+                video_enabled=self._video_enabled,
+            )
+        if isinstance(username, str):
+            self._peer_media_entry(username)
+
+    async def _on_user_left(self, payload: Dict[str, object]) -> Optional[Dict[str, object]]:
+        username = payload.get("username")
+        participants = payload.get("participants")
+        if isinstance(participants, list):
+            self._set_peers(self._coerce_string_list(participants))
+        elif username and username in self._peer_set:
+            self._peers.remove(username)
+            self._peer_set.discard(username)
+        if self._video_client:
+            self._video_client.update_peers(self._peers)
+        if self._presenter == username:
+            self._presenter = None
+        if self._username:
+            self._peer_media_entry(
+                self._username,
+                audio_enabled=self._audio_enabled,
+                video_enabled=self._video_enabled,
+            )
+        if isinstance(username, str):
+            self._peer_media.pop(username, None)
+            self._presence.pop(username, None)
+            await self._broadcast_presence_sync()
+
+    async def _on_chat_message(self, payload: Dict[str, object]) -> Optional[Dict[str, object]]:
+        message = {
+            "sender": payload.get("sender"),
+            "message": payload.get("message"),
+            "timestamp_ms": payload.get("timestamp_ms"),
+        }
+        # Preserve recipients if present (for UI rendering and local snapshot)
+        if isinstance(payload.get("recipients"), list):
+            message["recipients"] = [
+                str(x).strip()
+                for x in payload.get("recipients")
+                if isinstance(x, str) and str(x).strip()
+            ]
+        self._chat_history.append(message)
+
+    async def _on_file_offer(self, payload: Dict[str, object]) -> Optional[Dict[str, object]]:
+        catalog = self._file_catalog
+        if payload.get("files"):
+            for file in payload["files"]:
+                if isinstance(file, dict) and file.get("file_id"):
+                    catalog[file["file_id"]] = file
+                    catalog.move_to_end(file["file_id"])
+        elif payload.get("file_id"):
+            catalog[payload["file_id"]] = payload
+            catalog.move_to_end(payload["file_id"])
+        self._trim_file_catalog()
+
+    def _trim_file_catalog(self) -> None:
+        catalog = self._file_catalog
+        while len(catalog) > FILE_CATALOG_LIMIT:
+            catalog.popitem(last=False)
+
+    async def _on_video_status(self, payload: Dict[str, object]) -> Optional[Dict[str, object]]:
+        username = payload.get("username")
+        if isinstance(username, str):
+            entry = self._peer_media_entry(username)
+            if "audio_enabled" in payload:
+                entry["audio_enabled"] = bool(payload.get("audio_enabled"))
+            if "video_enabled" in payload:
+                entry["video_enabled"] = bool(payload.get("video_enabled"))
+            if username == self._username and "video_enabled" in payload:
+                self._video_enabled = bool(payload.get("video_enabled"))
+
+    async def _on_audio_status(self, payload: Dict[str, object]) -> Optional[Dict[str, object]]:
+        username = payload.get("username")
+        if isinstance(username, str):
+            entry = self._peer_media_entry(username)
+            if "audio_enabled" in payload:
+                entry["audio_enabled"] = bool(payload.get("audio_enabled"))
+            if username == self._username and "audio_enabled" in payload:
+                self._audio_enabled = bool(payload.get("audio_enabled"))
+            presence_entry = self._presence.get(username)
+            if presence_entry is not None and "audio_enabled" in payload:
+                audio_enabled = bool(payload.get("audio_enabled"))
+                if presence_entry.audio_enabled != audio_enabled:
+                    presence_entry.audio_enabled = audio_enabled
+                    self._mark_presence_dirty(username)
+
+    async def _on_kicked(self, payload: Dict[str, object]) -> Optional[Dict[str, object]]:
+        reason = str(payload.get("reason") or "An administrator removed you from this meeting.")
+        self._kicked = True
+        self._kick_reason = reason
+        self._connected = False
+        await self._stop_media_clients()
+        if self._client:
+            await self._client.close()
+        self._client = None
+        self._file_client = None
+        self._screen_publisher = None
+        self._set_peers([])
+        self._chat_history.clear()
+        self._file_catalog.clear()
+        self._peer_media.clear()
+        self._presenter = None
+        self._cancel_time_limit_watch()
+        self._time_limit_exit_triggered = False
+        self._time_limit = None
+        await self._broadcast_session_status("kicked", message=reason)
+        await self._stop_ui_server()
+
+    async def _on_presence_sync(self, payload: Dict[str, object]) -> Optional[Dict[str, object]]:
+        participants = payload.get("participants")
+        if isinstance(participants, list):
+            self._presence.clear()
+            for item in participants:
+                if isinstance(item, dict):
+                    normalized = self._normalize_presence_entry(item)
+                    if normalized:
+                        self._presence[normalized.username] = normalized
+            await self._broadcast_presence_sync()
+
+    async def _on_presence_update(self, payload: Dict[str, object]) -> Optional[Dict[str, object]]:
+        normalized = self._normalize_presence_entry(payload)
+        if normalized:
+            previous = self._presence.get(normalized.username)
+            self._presence[normalized.username] = normalized
+            if normalized.username == self._username:
+                self._local_hand_raised = normalized.hand_raised
+                if normalized.latency_ms is not None:
                     self._own_latency = {
-                        "latency_ms": payload.get("latency_ms"),
-                        "jitter_ms": payload.get("jitter_ms"),
+                        "latency_ms": normalized.latency_ms,
+                        "jitter_ms": normalized.jitter_ms,
                     }
-                await self._broadcast_presence_update(entry)
-        elif action == ControlAction.TIME_LIMIT_UPDATE:
-            normalized = self._normalize_time_limit(payload)
-            self._time_limit = normalized
-            payload = normalized or {}
-            self._schedule_time_limit_watch(normalized)
-        elif action == ControlAction.ADMIN_NOTICE:
-            notice = self._normalize_admin_notice(payload)
-            if notice:
-                self._admin_notices.append(notice)
-                if len(self._admin_notices) > 100:
-                    self._admin_notices = self._admin_notices[-100:]
-                payload = notice
-            else:
-                payload = {}
+            if previous is None or previous.as_tuple() != normalized.as_tuple():
+                self._mark_presence_dirty(normalized.username)
+
+    async def _on_typing_status(self, payload: Dict[str, object]) -> Optional[Dict[str, object]]:
+        username = payload.get("username")
+        is_typing = bool(payload.get("is_typing", False))
+        entry = self._presence.get(username) if isinstance(username, str) else None
+        if entry is not None and entry.is_typing != is_typing:
+            entry.is_typing = is_typing
+            self._mark_presence_dirty(username)
+
+    async def _on_hand_status(self, payload: Dict[str, object]) -> Optional[Dict[str, object]]:
+        username = payload.get("username")
+        hand_raised = bool(payload.get("hand_raised", False))
+        entry = self._presence.get(username) if isinstance(username, str) else None
+        if entry is not None:
+            if username == self._username:
+                self._local_hand_raised = hand_raised
+            if entry.hand_raised != hand_raised:
+                entry.hand_raised = hand_raised
+                self._mark_presence_dirty(username)
+
+    async def _on_reaction(self, payload: Dict[str, object]) -> Optional[Dict[str, object]]:
+        reaction = {
+            "username": payload.get("username"),
+            "reaction": payload.get("reaction"),
+            "timestamp_ms": payload.get("timestamp_ms"),
+        }
+        self._reaction_log.append(reaction)
+
+    async def _on_latency_update(self, payload: Dict[str, object]) -> Optional[Dict[str, object]]:
+        username = payload.get("username")
+        entry = self._presence.get(username) if isinstance(username, str) else None
+        if entry is not None:
+            latency_ms = _to_float(payload.get("latency_ms"))
+            jitter_ms = _to_float(payload.get("jitter_ms"))
+            # Stored values only move past the threshold, so slow drift still surfaces.
+            if not (
+                _latency_moved(entry.latency_ms, latency_ms)
+                or _latency_moved(entry.jitter_ms, jitter_ms)
+            ):
+                return None
+            entry.latency_ms = latency_ms
+            entry.jitter_ms = jitter_ms
+            if username == self._username:
+                self._own_latency = {
+                    "latency_ms": entry.latency_ms,
+                    "jitter_ms": entry.jitter_ms,
+                }
+            self._mark_presence_dirty(username)
+
+    async def _on_time_limit_update(
+        self, payload: Dict[str, object]
+    ) -> Optional[Dict[str, object]]:
+        normalized = self._normalize_time_limit(payload)
+        self._time_limit = normalized
+        self._schedule_time_limit_watch(normalized)
+        return normalized or {}
+
+    async def _on_admin_notice(self, payload: Dict[str, object]) -> Optional[Dict[str, object]]:
+        notice = self._normalize_admin_notice(payload)
+        if not notice:
+            return {}
+        self._admin_notices.append(notice)
+        return notice
+
+    @_invalidates_snapshot
+    async def _handle_ui_message(self, data: Dict[str, object]) -> None:
+        """Handle messages coming from the web UI via WebSocket."""
+
+        kind = data.get("type")
+        handler = self._ui_handlers.get(kind) if isinstance(kind, str) else None
+        if handler is None:
+            logger.warning("Unhandled UI message: %s", data)
+            return
+        # Forwarding handlers hand back the client coroutine itself, so it is awaited
+        # here once instead of through an extra await frame per message.
+        pending = handler(data.get("payload", {}))
+        if pending is not None:
+            await pending
+
+    async def _ui_join(self, payload: Dict[str, object]) -> None:
+        if self._kicked:
+            await self._broadcast_session_status(
+                "kicked",
+                message=self._kick_reason or "An administrator removed you from this meeting.",
+            )
+            return
+        username = str(payload.get("username") or self._generate_username())
+        try:
+            await self._start_session(username)
+        except Exception:
+            logger.exception("Failed to establish collaboration session")
+
+    def _ui_chat_send(self, payload: Dict[str, object]) -> Optional[Awaitable[None]]:
+        if not self._client:
+            return None
+        message = payload.get("message", "")
+        raw_recipients = payload.get("recipients")
+        recipients: Optional[List[str]] = None
+        if isinstance(raw_recipients, list):
+            recipients = [
+                str(x).strip() for x in raw_recipients if isinstance(x, str) and str(x).strip()
+            ]
+            if not recipients:
+                recipients = None
+        return self._client.send_chat(message, recipients=recipients)
+
+    def _ui_request_presenter(self, payload: Dict[str, object]) -> Optional[Awaitable[None]]:
+        if not self._client:
+            return None
+        return self._client.send(ControlAction.PRESENTER_GRANTED, {})
+
+    def _ui_release_presenter(self, payload: Dict[str, object]) -> Optional[Awaitable[None]]:
+        if not self._client:
+            return None
+        return self._client.send(ControlAction.PRESENTER_REVOKED, {})
 
-        await self._ws_hub.broadcast(
+    def _ui_file_request_list(self, payload: Dict[str, object]) -> Optional[Awaitable[None]]:
+        if not self._client:
+            return None
+        return self._client.send(ControlAction.FILE_REQUEST, {"request": "list"})
+
+    def _ui_file_download(self, payload: Dict[str, object]) -> Optional[Awaitable[None]]:
+        if not self._client:
+            return None
+        file_id = payload.get("file_id")
+        if not file_id:
+            return None
+        self._broadcast(
             {
-                "type": action.value,
-                "payload": payload,
+                "type": "file_download_ready",
+                "payload": {
+                    "file_id": file_id,
+                    "url": f"/api/files/download/{file_id}",
+                },
             }
         )
+        return None
 
-    async def _handle_ui_message(self, data: Dict[str, object]) -> None:
-        """Handle messages coming from the web UI via WebSocket."""
+    def _ui_toggle_audio(self, payload: Dict[str, object]) -> Optional[Awaitable[None]]:
+        if not self._client:
+            return None
+        enabled = bool(payload.get("enabled", False))
+        self._set_audio_enabled(enabled)
+        return self._client.send(ControlAction.AUDIO_STATUS, {"audio_enabled": enabled})
 
-        kind = data.get("type")
-        payload = data.get("payload", {})
-        if kind == "join":
-            if self._kicked:
-                await self._broadcast_session_status(
-                    "kicked",
-                    message=self._kick_reason or "An administrator removed you from this meeting.",
-                )
-                return
-            username = str(payload.get("username") or self._generate_username())
-            try:
-                await self._start_session(username)
-            except Exception:
-                logger.exception("Failed to establish collaboration session")
-        elif kind == "chat_send":
-            if not self._client:
-                return
-            message = payload.get("message", "")
-            raw_recipients = payload.get("recipients")
-            recipients: Optional[List[str]] = None
-            if isinstance(raw_recipients, list):
-                recipients = [str(x).strip() for x in raw_recipients if isinstance(x, str) and str(x).strip()]
-                if not recipients:
-                    recipients = None
-            await self._client.send_chat(message, recipients=recipients)
-        elif kind == "request_presenter":
-            if not self._client:
-                return
-            await self._client.send(ControlAction.PRESENTER_GRANTED, {})
-        elif kind == "release_presenter":
-            if not self._client:
-                return
-            await self._client.send(ControlAction.PRESENTER_REVOKED, {})
-        elif kind == "file_request_list":
-            if not self._client:
-                return
-            await self._client.send(ControlAction.FILE_REQUEST, {"request": "list"})
-        elif kind == "file_download":
-            if not self._client:
-                return
-            file_id = payload.get("file_id")
-            if file_id:
-                await self._ws_hub.broadcast(
-                    {
-                        "type": "file_download_ready",
-                        "payload": {
-                            "file_id": file_id,
-                            "url": f"/api/files/download/{file_id}",
-                        },
-                    }
-                )
-        elif kind == "toggle_audio":
-            if not self._client:
-                return
-            enabled = bool(payload.get("enabled", False))
-            self._set_audio_enabled(enabled)
-            await self._client.send(ControlAction.AUDIO_STATUS, {"audio_enabled": enabled})
-        elif kind == "toggle_video":
-            if not self._client:
-                return
-            enabled = bool(payload.get("enabled", False))
-            self._set_video_enabled(enabled)
-            await self._client.send(ControlAction.VIDEO_STATUS, {"video_enabled": enabled})
-        elif kind == "typing":
-            if not self._client or self._username is None:
-                return
-            is_typing = bool(payload.get("is_typing", False))
-            await self._client.send_typing(is_typing)
-            entry = self._presence.get(self._username)
-            if entry is not None:
-                entry["is_typing"] = is_typing
-                asyncio.create_task(self._broadcast_presence_update(entry))
-        elif kind == "toggle_hand":
-            if not self._client or self._username is None:
-                return
-            desired = bool(payload.get("hand_raised", False))
-            self._local_hand_raised = desired
-            await self._client.send_hand_status(desired)
-            entry = self._presence.get(self._username)
-            if entry is not None:
-                entry["hand_raised"] = desired
-                asyncio.create_task(self._broadcast_presence_update(entry))
-        elif kind == "send_reaction":
-            if not self._client:
-                return
-            reaction = str(payload.get("reaction", "")).strip()
-            if not reaction:
-                return
-            await self._client.send_reaction(reaction)
-        elif kind == "copy_file_link":
-            file_id = payload.get("file_id")
-            if isinstance(file_id, str) and file_id:
-                await self._ws_hub.broadcast(
-                    {
-                        "type": "file_share_link",
-                        "payload": {
-                            "file_id": file_id,
-                            "url": f"/api/files/download/{file_id}",
-                        },
-                    }
-                )
-        elif kind == "toggle_presentation":
-            desired = bool(payload.get("enabled", False))
-            if not self._client:
-                return
-            if desired:
-                await self._client.send(ControlAction.PRESENTER_GRANTED, {})
-                self._screen_requested = True
-            else:
-                await self._client.send(ControlAction.PRESENTER_REVOKED, {})
-                self._screen_requested = False
-        elif kind == "leave_session":
-            reason = payload.get("reason")
-            if isinstance(reason, str) and reason.strip():
-                await self._leave_session(reason=reason.strip())
-            else:
-                await self._leave_session(reason=TIME_LIMIT_LEAVE_REASON if payload.get("auto") else None)
-        elif kind == "heartbeat":
-            # UI-level heartbeat - ignore for now.
+    def _ui_toggle_video(self, payload: Dict[str, object]) -> Optional[Awaitable[None]]:
+        if not self._client:
+            return None
+        enabled = bool(payload.get("enabled", False))
+        self._set_video_enabled(enabled)
+        return self._client.send(ControlAction.VIDEO_STATUS, {"video_enabled": enabled})
+
+    async def _ui_typing(self, payload: Dict[str, object]) -> None:
+        if not self._client or self._username is None:
+            return
+        is_typing = bool(payload.get("is_typing", False))
+        await self._client.send_typing(is_typing)
+        entry = self._presence.get(self._username)
+        if entry is not None:
+            entry.is_typing = is_typing
+            self._mark_presence_dirty(self._username)
+
+    async def _ui_toggle_hand(self, payload: Dict[str, object]) -> None:
+        if not self._client or self._username is None:
+            return
+        desired = bool(payload.get("hand_raised", False))
+        self._local_hand_raised = desired
+        await self._client.send_hand_status(desired)
+        entry = self._presence.get(self._username)
+        if entry is not None:
+            entry.hand_raised = desired
+            self._mark_presence_dirty(self._username)
+
+    def _ui_send_reaction(self, payload: Dict[str, object]) -> Optional[Awaitable[None]]:
+        if not self._client:
+            return None
+        reaction = str(payload.get("reaction", "")).strip()
+        if not reaction:
+            return None
+        return self._client.send_reaction(reaction)
+
+    def _ui_copy_file_link(self, payload: Dict[str, object]) -> Optional[Awaitable[None]]:
+        file_id = payload.get("file_id")
+        if not isinstance(file_id, str) or not file_id:
+            return None
+        self._broadcast(
+            {
+                "type": "file_share_link",
+                "payload": {
+                    "file_id": file_id,
+                    "url": f"/api/files/download/{file_id}",
+                },
+            }
+        )
+        return None
+
+    async def _ui_toggle_presentation(self, payload: Dict[str, object]) -> None:
+        desired = bool(payload.get("enabled", False))
+        if not self._client:
             return
+        if desired:
+            await self._client.send(ControlAction.PRESENTER_GRANTED, {})
+            self._screen_requested = True
         else:
-            logger.warning("Unhandled UI message: %s", data)
+            await self._client.send(ControlAction.PRESENTER_REVOKED, {})
+            self._screen_requested = False
+
+    def _ui_leave_session(self, payload: Dict[str, object]) -> Awaitable[None]:
+        reason = payload.get("reason")
+        if isinstance(reason, str) and reason.strip():
+            return self._leave_session(reason=reason.strip())
+        return self._leave_session(reason=TIME_LIMIT_LEAVE_REASON if payload.get("auto") else None)
 
+    def _ui_heartbeat(self, payload: Dict[str, object]) -> None:
+        # UI-level heartbeat - ignore for now.
+        return None
+
+    @_invalidates_snapshot
     async def _leave_session(self, *, reason: Optional[str] = None) -> None:
         if not self._client and not self._connected:
             await self._broadcast_session_status("idle")
@@ -1387,11 +2016,13 @@ class ClientApp:
         self._audio_enabled = False
         self._video_enabled = False
         self._screen_requested = False
-        self._peers = []
-        self._chat_history = []
-        self._file_catalog = {}
+        self._set_peers([])
+        self._chat_history.clear()
+        self._file_catalog.clear()
         self._presenter = None
         self._presence.clear()
+        self._cancel_presence_flush()
+        self._cancel_latency_metrics_flush()
         self._reaction_log.clear()
         self._own_latency = None
         self._local_hand_raised = False
@@ -1399,9 +2030,9 @@ class ClientApp:
 
         if username:
             self._prefill_username = username
-            await self._ws_hub.broadcast(
+            self._broadcast(
                 {
-                    "type": ControlAction.USER_LEFT.value,
+                    "type": _ACTION_VALUES[ControlAction.USER_LEFT],
                     "payload": {"username": username},
                 }
             )
@@ -1413,18 +2044,35 @@ class ClientApp:
     async def _ensure_media_clients(self, media: Dict[str, int]) -> None:
         if self._username is None:
             return
-        changed = False
-        for key in ("video_port", "audio_port", "screen_port", "file_port", "latency_port"):
-            if key in media and media[key] != self._media_config.get(key):
-                self._media_config[key] = media[key]
-                changed = True
-
+        current = (
+            self._video_port,
+            self._audio_port,
+            self._screen_port,
+            self._file_port,
+            self._latency_port,
+        )
+        # Ports the server leaves out keep their current value.
+        requested = (
+            media.get("video_port", self._video_port),
+            media.get("audio_port", self._audio_port),
+            media.get("screen_port", self._screen_port),
+            media.get("file_port", self._file_port),
+            media.get("latency_port", self._latency_port),
+        )
+        changed = requested != current
         if changed:
+            (
+                self._video_port,
+                self._audio_port,
+                self._screen_port,
+                self._file_port,
+                self._latency_port,
+            ) = requested
             # Recreate helpers tied to port numbers.
             if self._file_client is not None:
                 self._file_client = FileClient(
                     host=self._server_host,
-                    port=self._media_config["file_port"],
+                    port=self._file_port,
                     username=self._username,
                 )
             if self._screen_publisher is not None:
@@ -1432,52 +2080,59 @@ class ClientApp:
                 self._screen_publisher = ScreenPublisher(
                     username=self._username,
                     server_host=self._server_host,
-                    port=self._media_config["screen_port"],
+                    port=self._screen_port,
                 )
 
+        # Video and audio set up independent sockets and devices, so a join waits for the
+        # slower of the two rather than for both in turn. Each logs its own failures.
+        restarts = []
         if self._video_client is None or changed:
-            if self._video_client is not None:
-                await self._video_client.stop()
-            try:
-                video_port = self._media_config.get("video_port", DEFAULT_VIDEO_PORT)
-                self._video_client = VideoClient(
-                    username=self._username,
-                    server_host=self._server_host,
-                    server_port=video_port,
-                    on_frame=self._handle_video_frame,
-                )
-                await self._video_client.start()
-                self._video_client.update_peers(self._peers)
-                self._video_client.set_capture_enabled(self._video_enabled)
-            except Exception:  # pragma: no cover - hardware dependent
-                logger.exception("Unable to start video client")
-                self._video_client = None
-
+            restarts.append(self._restart_video_client(self._username))
         if self._audio_client is None or changed:
-            if self._audio_client is not None:
-                await self._audio_client.stop()
-            try:
-                audio_port = self._media_config.get("audio_port", DEFAULT_AUDIO_PORT)
-                self._audio_client = AudioClient(
-                    username=self._username,
-                    server_host=self._server_host,
-                    server_port=audio_port,
-                )
-                await self._audio_client.start()
-                self._audio_client.set_capture_enabled(self._audio_enabled)
-            except Exception:  # pragma: no cover - hardware dependent
-                logger.exception("Unable to start audio client")
-                self._audio_client = None
+            restarts.append(self._restart_audio_client(self._username))
+        if restarts:
+            await asyncio.gather(*restarts)
 
         await self._start_latency_probe()
 
-    async def _handle_video_frame(self, username: str, frame_b64: str) -> None:
-        await self._ws_hub.broadcast(
-            {
-                "type": "video_frame",
-                "payload": {
-                    "username": username,
-                    "frame": frame_b64,
-                },
-            }
-        )
+    async def _restart_video_client(self, username: str) -> None:
+        if self._video_client is not None:
+            await self._video_client.stop()
+        try:
+            self._video_client = VideoClient(
+                username=username,
+                server_host=self._server_host,
+                server_port=self._video_port,
+                on_frame=self._handle_video_frame,
+            )
+            await self._video_client.start()
+            self._video_client.update_peers(self._peers)
+            self._video_client.set_capture_enabled(self._video_enabled)
+        except Exception:  # pragma: no cover - hardware dependent
+            logger.exception("Unable to start video client")
+            self._video_client = None
+
+    async def _restart_audio_client(self, username: str) -> None:
+        if self._audio_client is not None:
+            await self._audio_client.stop()
+        try:
+            self._audio_client = AudioClient(
+                username=username,
+                server_host=self._server_host,
+                server_port=self._audio_port,
+            )
+            await self._audio_client.start()
+            self._audio_client.set_capture_enabled(self._audio_enabled)
+        except Exception:  # pragma: no cover - hardware dependent
+            logger.exception("Unable to start audio client")
+            self._audio_client = None
+
+    def _handle_video_frame(self, username: str, frame: bytes) -> None:
+        hub = self._ws_hub
+        if not hub.has_connections:
+            return
+        # One binary message per frame (name length, name, raw JPEG), so the JPEG is
+        # never base64-encoded or passed through a JSON encoder on its way to the UI.
+        # Only the newest frame per participant matters; a tab that falls behind skips
+        # straight to it instead of building a backlog.
+        hub.broadcast_latest(f"video_frame:{username}", _video_frame_prefix(username) + frame)
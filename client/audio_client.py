@@ -53,6 +53,10 @@ class AudioClient:
         self._start_streams()
         self._register()
 
+    @property
+    def is_running(self) -> bool:
+        return self._running.is_set() or self._transport is not None
+
     async def stop(self) -> None:
         self._running.clear()
         self._capture_enabled = False
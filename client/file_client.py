@@ -5,8 +5,6 @@ import json
 import struct
 from typing import AsyncIterator, Awaitable, Callable, Optional, Tuple
 
-from fastapi import UploadFile
-
 from shared.protocol import DEFAULT_FILE_PORT
 
 _LENGTH_STRUCT = struct.Struct("!I")
@@ -22,19 +20,15 @@ class FileClient:
         self._port = port
         self._username = username
 
-    async def upload(self, upload_file: UploadFile, *, progress: Optional[ProgressCallback] = None) -> str:
-        filename = upload_file.filename or "upload.bin"
-        await upload_file.seek(0)
-        total_size = upload_file.size or 0
-        if total_size == 0:
-            # UploadFile.size may be missing; fallback by reading once.
-            content = await upload_file.read()
-            total_size = len(content)
-            await upload_file.seek(0)
-            buffered = content
-        else:
-            buffered = b""
-
+    async def upload(
+        self,
+        filename: str,
+        chunks: AsyncIterator[bytes],
+        total_size: int,
+        *,
+        progress: Optional[ProgressCallback] = None,
+    ) -> str:
+        """Stream ``chunks`` to the file server; ``total_size`` must match their sum."""
         reader, writer = await asyncio.open_connection(self._host, self._port)
         try:
             header = {
@@ -46,20 +40,11 @@ class FileClient:
             await self._send_json(writer, header)
 
             sent = 0
-            if buffered:
-                await self._write_chunk(writer, buffered)
-                sent += len(buffered)
+            async for chunk in chunks:
+                await self._write_chunk(writer, chunk)
+                sent += len(chunk)
                 if progress:
                     await progress(sent, total_size)
-            else:
-                while True:
-                    chunk = await upload_file.read(64 * 1024)
-                    if not chunk:
-                        break
-                    await self._write_chunk(writer, chunk)
-                    sent += len(chunk)
-                    if progress:
-                        await progress(sent, total_size)
             await self._write_chunk(writer, b"")
 
             response = await self._read_json(reader)
@@ -73,7 +58,13 @@ class FileClient:
             except Exception:
                 pass
 
-    async def download(self, file_id: str) -> Tuple[dict, AsyncIterator[bytes]]:
+    async def download(
+        self,
+        file_id: str,
+        *,
+        min_chunk_size: int = 0,
+    ) -> Tuple[dict, AsyncIterator[bytes]]:
+        """Request ``file_id``; the stream joins server frames into ``min_chunk_size`` pieces."""
         reader, writer = await asyncio.open_connection(self._host, self._port)
 
         header = {"action": "download", "file_id": file_id}
@@ -86,12 +77,21 @@ class FileClient:
             raise FileNotFoundError(file_id)
 
         async def stream() -> AsyncIterator[bytes]:
+            buffer = bytearray()
             try:
                 while True:
                     chunk = await self._read_chunk(reader)
                     if chunk is None:
                         break
-                    yield chunk
+                    if not buffer and len(chunk) >= min_chunk_size:
+                        yield chunk
+                        continue
+                    buffer += chunk
+                    if len(buffer) >= min_chunk_size:
+                        yield bytes(buffer)
+                        buffer.clear()
+                if buffer:
+                    yield bytes(buffer)
             finally:
                 writer.close()
                 try:
@@ -43,6 +43,10 @@ class ScreenPublisher:
         self._stop_event.clear()
         self._task = asyncio.create_task(self._run())
 
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
     async def stop(self) -> None:
         self._stop_event.set()
         if self._task:
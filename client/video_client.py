@@ -1,18 +1,18 @@
 from __future__ import annotations
 
 import asyncio
-import base64
 import json
 import time
 import zlib
-from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
 
 from shared.protocol import MEDIA_HEADER_STRUCT, MediaFrameHeader, PayloadType
 
-FrameCallback = Callable[[str, str], Awaitable[None]]
+# Called from the datagram callback, so it must not block; it only queues the frame.
+FrameCallback = Callable[[str, bytes], None]
 
 
 def stream_id_for(username: str) -> int:
@@ -70,6 +70,10 @@ class VideoClient:
         self._stop_event.clear()
         self._capture_task = asyncio.create_task(self._capture_loop())
 
+    @property
+    def is_running(self) -> bool:
+        return self._capture_task is not None or self._transport is not None
+
     async def stop(self) -> None:
         self._stop_event.set()
         if self._capture_task:
@@ -104,8 +108,7 @@ class VideoClient:
             return
         payload = data[MEDIA_HEADER_STRUCT.size :]
         username = self._peers.get(header.stream_id, f"stream-{header.stream_id}")
-        encoded = base64.b64encode(payload).decode("ascii")
-        asyncio.create_task(self._on_frame(username, encoded))
+        self._on_frame(username, payload)
 
     async def _capture_loop(self) -> None:
         cap: Optional[cv2.VideoCapture] = None
@@ -135,7 +138,6 @@ class VideoClient:
                 if not success:
                     continue
                 payload = buffer.tobytes()
-                encoded = base64.b64encode(payload).decode("ascii")
                 header = MediaFrameHeader(
                     stream_id=self._stream_id,
                     sequence_number=self._next_sequence(),
@@ -144,7 +146,7 @@ class VideoClient:
                 ).pack()
                 if self._transport:
                     self._transport.sendto(header + payload, (self._server_host, self._server_port))
-                await self._on_frame(self._username, encoded)
+                self._on_frame(self._username, payload)
                 await asyncio.sleep(frame_interval)
         finally:
             if cap is not None:
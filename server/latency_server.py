@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 import asyncio
+import hmac
 import json
 import logging
 import time
 from typing import Optional
 
+from shared.protocol import (
+    LATENCY_PROBE_PREFIX_STRUCT,
+    LATENCY_PROBE_STRUCT,
+    LATENCY_PROBE_VERSION,
+    LATENCY_REPLY_STRUCT,
+    latency_probe_tag,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +29,9 @@ class _LatencyProtocol(asyncio.DatagramProtocol):
     def datagram_received(self, data: bytes, addr) -> None:  # pragma: no cover - network callback
         if self._transport is None:
             return
+        if data[:1] == bytes((LATENCY_PROBE_VERSION,)):
+            self._handle_binary_probe(data, addr)
+            return
         try:
             payload = json.loads(data.decode("utf-8"))
         except (UnicodeDecodeError, json.JSONDecodeError):
@@ -49,6 +61,30 @@ class _LatencyProtocol(asyncio.DatagramProtocol):
         except Exception:
             logger.exception("Failed to respond to latency probe for %s", addr)
 
+    def _handle_binary_probe(
+        self, data: bytes, addr
+    ) -> None:  # pragma: no cover - network callback
+        if len(data) < LATENCY_PROBE_STRUCT.size:
+            logger.debug("Discarding truncated latency probe from %s", addr)
+            return
+        _, sequence, timestamp_ms, tag = LATENCY_PROBE_STRUCT.unpack_from(data)
+        if self._expected_key:
+            expected = latency_probe_tag(
+                data[: LATENCY_PROBE_PREFIX_STRUCT.size],
+                data[LATENCY_PROBE_STRUCT.size :],
+                self._expected_key,
+            )
+            if not hmac.compare_digest(tag, expected):
+                logger.warning("Latency probe rejected due to invalid key from %s", addr)
+                return
+        try:
+            reply = LATENCY_REPLY_STRUCT.pack(
+                LATENCY_PROBE_VERSION, sequence, timestamp_ms, int(time.time() * 1000)
+            )
+            self._transport.sendto(reply, addr)
+        except Exception:
+            logger.exception("Failed to respond to latency probe for %s", addr)
+
 
 class LatencyServer:
     """Responds to UDP latency probes from clients."""
@@ -10,6 +10,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, Optional, TypedDict
 
+import hashlib
+import hmac
 import json
 import struct
 
@@ -160,6 +162,29 @@ class MediaFrameHeader:
         return cls(stream_id, sequence_number, timestamp_ms, payload_type)
 
 
+LATENCY_PROBE_VERSION = 2
+# version, sequence, client timestamp (ms), auth tag; followed by the UTF-8 username.
+LATENCY_PROBE_STRUCT = struct.Struct("!BIQ16s")
+# The leading version, sequence and timestamp fields, which the auth tag covers.
+LATENCY_PROBE_PREFIX_STRUCT = struct.Struct("!BIQ")
+# version, sequence, client timestamp (ms), server timestamp (ms).
+LATENCY_REPLY_STRUCT = struct.Struct("!BIQQ")
+
+
+def latency_probe_tag(prefix: bytes, username: bytes, pre_shared_key: Optional[str]) -> bytes:
+    """Return the 16-byte tag proving a latency probe was sent with the pre-shared key.
+
+    ``prefix`` is the packed version, sequence and timestamp, so a captured tag is only
+    valid for the probe it came from.
+    """
+
+    if not pre_shared_key:
+        return bytes(16)
+    mac = hmac.new(pre_shared_key.encode("utf-8"), prefix, hashlib.sha256)
+    mac.update(username)
+    return mac.digest()[:16]
+
+
 class PayloadType(Enum):
     """Indicates the content type carried in a UDP payload."""
 
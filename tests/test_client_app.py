@@ -0,0 +1,681 @@
+import asyncio
+import json
+import pathlib
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException, Request
+
+import client.app as app_module
+from client.app import (
+    DOWNLOAD_COALESCE_BYTES,
+    FILE_CATALOG_LIMIT,
+    LATENCY_PENDING_LIMIT,
+    PRESENCE_FLUSH_DELAY_SECONDS,
+    REACTION_LOG_LIMIT,
+    UI_SEND_QUEUE_LIMIT,
+    UI_WRITE_BATCH_LIMIT,
+    ClientApp,
+    LatencyProbe,
+    PresenceEntry,
+    WebSocketHub,
+)
+from shared.protocol import ControlAction
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def test_sanitize_filename_replaces_unsafe_characters():
+    app = ClientApp(username=None, server_host="localhost")
+    assert app._sanitize_filename('re"port\\v1.txt') == "re_port_v1.txt"
+    assert app._sanitize_filename("héllo wörld.pdf") == "h_llo w_rld.pdf"
+    assert app._sanitize_filename("日本.txt") == "__.txt"
+
+
+def test_sanitize_filename_falls_back_when_empty():
+    app = ClientApp(username=None, server_host="localhost")
+    assert app._sanitize_filename("") == "download.bin"
+    assert app._sanitize_filename("   ") == "download.bin"
+
+
+@pytest.mark.anyio("asyncio")
+async def test_snapshot_message_is_cached_until_state_changes():
+    app = ClientApp(username=None, server_host="localhost")
+    first = app._snapshot_message()
+    assert app._snapshot_message() is first
+    assert json.loads(first)["payload"]["latency"] is None
+
+    await app._on_latency_metrics(12.5, 1.5)
+
+    refreshed = app._snapshot_message()
+    assert refreshed is not first
+    assert json.loads(refreshed)["payload"]["latency"] == {"latency_ms": 12.5, "jitter_ms": 1.5}
+
+
+@pytest.mark.anyio("asyncio")
+async def test_presence_changes_are_coalesced_into_one_batch():
+    app = ClientApp(username=None, server_host="localhost")
+    tab = _FakeSocket()
+    await app._ws_hub.connect(tab)
+    app._presence["alice"] = PresenceEntry(username="alice")
+    app._presence["bob"] = PresenceEntry(username="bob")
+
+    app._presence["alice"].hand_raised = True
+    app._mark_presence_dirty("alice")
+    app._presence["bob"].hand_raised = True
+    app._mark_presence_dirty("bob")
+    await asyncio.sleep(PRESENCE_FLUSH_DELAY_SECONDS * 3)
+
+    assert len(tab.sent) == 1
+    message = json.loads(tab.sent[0])
+    assert message["type"] == "presence_batch"
+    updates = sorted(message["payload"]["updates"], key=lambda entry: entry["username"])
+    assert [(entry["username"], entry["hand_raised"]) for entry in updates] == [
+        ("alice", True),
+        ("bob", True),
+    ]
+    await app._ws_hub.disconnect(tab)
+
+
+@pytest.mark.anyio("asyncio")
+async def test_latency_probe_expires_unanswered_probes(monkeypatch):
+    class _Transport:
+        def get_write_buffer_size(self):
+            return 0
+
+        def sendto(self, data, addr):
+            pass
+
+    probe = LatencyProbe("alice", "127.0.0.1", 9, interval=1.0)
+    probe._transport = _Transport()
+    for _ in range(LATENCY_PENDING_LIMIT + 10):
+        await probe._send_probe()
+    assert len(probe._pending) == LATENCY_PENDING_LIMIT
+
+    stale_ns = probe._pending[probe._sequence]
+    monkeypatch.setattr("client.app.time.monotonic_ns", lambda: stale_ns + 3_000_000_000)
+    await probe._send_probe()
+    assert list(probe._pending) == [probe._sequence]
+
+
+def test_generate_username_format():
+    app = ClientApp(username=None, server_host="localhost")
+    adjective, noun, number = app._generate_username().split("-")
+    assert adjective.isalpha() and noun.isalpha()
+    assert 100 <= int(number) <= 999
+
+
+class _FakeSocket:
+    def __init__(self, *, fail: bool = False) -> None:
+        self.fail = fail
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.fail:
+            raise RuntimeError("socket closed")
+        self.sent.append(text)
+
+    async def send_bytes(self, data):
+        if self.fail:
+            raise RuntimeError("socket closed")
+        self.sent.append(data)
+
+    def received(self):
+        """Decode every text message sent, unpacking batch messages into their frames."""
+        messages = []
+        for text in self.sent:
+            if isinstance(text, bytes):
+                continue
+            message = json.loads(text)
+            if message["type"] == "batch":
+                messages.extend(message["payload"]["frames"])
+            else:
+                messages.append(message)
+        return messages
+
+
+@pytest.mark.anyio("asyncio")
+async def test_hub_broadcast_drops_sockets_that_fail():
+    hub = WebSocketHub()
+    healthy, broken = _FakeSocket(), _FakeSocket(fail=True)
+    await hub.connect(healthy)
+    await hub.connect(broken)
+
+    await hub.broadcast({"type": "ping"})
+    await hub.broadcast({"type": "ping"})
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert healthy.received() == [{"type": "ping"}, {"type": "ping"}]
+    assert broken not in hub._connections
+    await hub.disconnect(healthy)
+
+
+@pytest.mark.anyio("asyncio")
+async def test_hub_drops_oldest_frames_for_a_stalled_socket():
+    hub = WebSocketHub()
+    stalled, healthy = _FakeSocket(), _FakeSocket()
+    await hub.connect(stalled)
+    await hub.connect(healthy)
+    # Cancelling the writer leaves the stalled socket's queue undrained.
+    hub._connections[stalled].writer.cancel()
+
+    for index in range(UI_SEND_QUEUE_LIMIT + 3):
+        hub.broadcast_text(str(index))
+        await asyncio.sleep(0)
+
+    queue = hub._connections[stalled].queue
+    assert queue.qsize() == UI_SEND_QUEUE_LIMIT
+    assert queue.get_nowait() == (None, "3")
+    assert len(healthy.sent) == UI_SEND_QUEUE_LIMIT + 3
+    await hub.disconnect(stalled)
+    await hub.disconnect(healthy)
+
+
+def test_normalize_presence_entry_coerces_payload_types():
+    app = ClientApp(username=None, server_host="localhost")
+    app._username = "alice"
+    entry = app._normalize_presence_entry(
+        {"username": "alice", "hand_raised": 1, "latency_ms": "12.5", "jitter_ms": "n/a"}
+    )
+    assert entry == PresenceEntry(username="alice", hand_raised=True, latency_ms=12.5, is_self=True)
+    assert app._normalize_presence_entry({"username": ""}) is None
+
+
+def test_normalize_presence_entry_accepts_complete_server_payload():
+    app = ClientApp(username=None, server_host="localhost")
+    raw = {
+        "username": "bob",
+        "is_presenter": False,
+        "audio_enabled": True,
+        "video_enabled": False,
+        "hand_raised": False,
+        "is_typing": True,
+        "latency_ms": 18,
+        "jitter_ms": None,
+        "last_seen_seconds": 0.5,
+    }
+    entry = app._normalize_presence_entry(raw)
+    assert entry == PresenceEntry(
+        username="bob", audio_enabled=True, is_typing=True, last_seen_seconds=0.5, latency_ms=18.0
+    )
+
+
+def test_normalize_time_limit_coerces_numeric_fields():
+    app = ClientApp(username=None, server_host="localhost")
+    status = app._normalize_time_limit(
+        {
+            "is_active": True,
+            "duration_seconds": "600",
+            "remaining_seconds": 12.9,
+            "end_timestamp": 1700000000,
+            "started_at": "bad",
+            "progress": 1.5,
+        }
+    )
+    assert status["duration_seconds"] == 600
+    assert status["remaining_seconds"] == 12
+    assert status["end_timestamp"] == 1700000000.0
+    assert status["started_at"] is None
+    assert status["updated_at"] is None
+    assert status["progress"] == 1.0
+
+
+@pytest.mark.anyio("asyncio")
+async def test_ui_messages_dispatch_to_handlers(monkeypatch):
+    app = ClientApp(username=None, server_host="localhost")
+    leave_mock = AsyncMock()
+    monkeypatch.setattr(app, "_leave_session", leave_mock)
+
+    await app._handle_ui_message({"type": "leave_session", "payload": {"reason": " bye "}})
+    await app._handle_ui_message({"type": "heartbeat", "payload": {}})
+    await app._handle_ui_message({"type": ["not", "hashable"]})
+
+    leave_mock.assert_awaited_once_with(reason="bye")
+
+
+@pytest.mark.anyio("asyncio")
+async def test_control_messages_relay_normalised_payloads():
+    app = ClientApp(username=None, server_host="localhost")
+    tab = _FakeSocket()
+    await app._ws_hub.connect(tab)
+
+    await app._handle_control_message(
+        ControlAction.ADMIN_NOTICE, {"message": " maintenance ", "level": "WARN", "timestamp": "5"}
+    )
+    await app._handle_control_message(ControlAction.REACTION, {"username": "bob", "reaction": "+1"})
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    # Both frames were produced in the same loop tick, so they share one batch.
+    assert len(tab.sent) == 1
+    batch = json.loads(tab.sent[0])
+    assert batch["type"] == "batch"
+    notice, reaction = batch["payload"]["frames"]
+    assert notice == {
+        "type": ControlAction.ADMIN_NOTICE.value,
+        "payload": {"message": "maintenance", "level": "warn", "actor": "admin", "timestamp": 5.0},
+    }
+    assert reaction["payload"] == {"username": "bob", "reaction": "+1"}
+    assert app._reaction_log[-1]["reaction"] == "+1"
+    await app._ws_hub.disconnect(tab)
+
+
+@pytest.mark.anyio("asyncio")
+async def test_relayed_frames_stay_ahead_of_a_later_presence_sync():
+    app = ClientApp(username=None, server_host="localhost")
+    tab = _FakeSocket()
+    await app._ws_hub.connect(tab)
+
+    # Both arrive in one read, so their handlers run before the relay flush callback.
+    await app._handle_control_message(ControlAction.USER_JOINED, {"username": "bob"})
+    await app._handle_control_message(
+        ControlAction.PRESENCE_SYNC, {"participants": [{"username": "bob"}]}
+    )
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    types = [message["type"] for message in tab.received()]
+    assert types[:2] == [ControlAction.USER_JOINED.value, "presence_sync"]
+    await app._ws_hub.disconnect(tab)
+
+
+@pytest.mark.anyio("asyncio")
+async def test_reaction_log_is_bounded_and_snapshot_keeps_latest():
+    app = ClientApp(username=None, server_host="localhost")
+
+    for index in range(REACTION_LOG_LIMIT + 5):
+        await app._handle_control_message(
+            ControlAction.REACTION, {"username": "bob", "reaction": str(index)}
+        )
+
+    assert len(app._reaction_log) == REACTION_LOG_LIMIT
+    reactions = app._build_snapshot()["reactions"]
+    assert len(reactions) == 50
+    assert reactions[-1]["reaction"] == str(REACTION_LOG_LIMIT + 4)
+
+
+@pytest.mark.anyio("asyncio")
+async def test_welcome_peer_media_prefers_server_state(monkeypatch):
+    app = ClientApp(username=None, server_host="localhost")
+    app._username = "alice"
+    app._audio_enabled = True
+    monkeypatch.setattr(app, "_ensure_media_clients", AsyncMock())
+    monkeypatch.setattr(app, "_start_latency_probe", AsyncMock())
+
+    await app._handle_control_message(
+        ControlAction.WELCOME,
+        {
+            "peers": ["alice", "bob", "carol", 7],
+            "media_state": {"bob": {"audio_enabled": True, "video_enabled": True}},
+        },
+    )
+
+    assert app._peers == ["alice", "bob", "carol"]
+    assert app._peer_media == {
+        "alice": {"audio_enabled": True, "video_enabled": False},
+        "bob": {"audio_enabled": True, "video_enabled": True},
+        "carol": {"audio_enabled": False, "video_enabled": False},
+    }
+
+
+@pytest.mark.anyio("asyncio")
+async def test_join_and_leave_keep_peer_list_and_set_in_step():
+    app = ClientApp(username=None, server_host="localhost")
+    app._set_peers(["alice"])
+
+    await app._handle_control_message(ControlAction.USER_JOINED, {"username": "bob"})
+    await app._handle_control_message(ControlAction.USER_JOINED, {"username": "bob"})
+    assert app._peers == ["alice", "bob"]
+
+    await app._handle_control_message(ControlAction.USER_LEFT, {"username": "alice"})
+    assert app._peers == ["bob"]
+    assert app._peer_set == {"bob"}
+
+    await app._handle_control_message(
+        ControlAction.USER_JOINED, {"username": "carol", "participants": ["bob", "carol", None]}
+    )
+    assert app._peers == ["bob", "carol"]
+    assert app._peer_set == {"bob", "carol"}
+
+
+@pytest.mark.anyio("asyncio")
+async def test_single_control_frame_is_sent_unwrapped():
+    app = ClientApp(username=None, server_host="localhost")
+    tab = _FakeSocket()
+    await app._ws_hub.connect(tab)
+
+    await app._handle_control_message(ControlAction.REACTION, {"username": "bob", "reaction": "+1"})
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    await app._handle_control_message(ControlAction.REACTION, {"username": "bob", "reaction": "!"})
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert [json.loads(text)["type"] for text in tab.sent] == [
+        ControlAction.REACTION.value,
+        ControlAction.REACTION.value,
+    ]
+    await app._ws_hub.disconnect(tab)
+
+
+@pytest.mark.anyio("asyncio")
+async def test_unchanged_presence_updates_are_not_rebroadcast():
+    app = ClientApp(username=None, server_host="localhost")
+    app._presence["bob"] = PresenceEntry(username="bob", hand_raised=True, latency_ms=20.0)
+
+    await app._handle_control_message(
+        ControlAction.HAND_STATUS, {"username": "bob", "hand_raised": True}
+    )
+    await app._handle_control_message(
+        ControlAction.LATENCY_UPDATE, {"username": "bob", "latency_ms": 20.4}
+    )
+    assert app._dirty_presence == set()
+    assert app._presence["bob"].latency_ms == 20.0
+
+    await app._handle_control_message(
+        ControlAction.LATENCY_UPDATE, {"username": "bob", "latency_ms": 21.5}
+    )
+    assert app._dirty_presence == {"bob"}
+    assert app._presence["bob"].latency_ms == 21.5
+    app._cancel_presence_flush()
+
+
+@pytest.mark.anyio("asyncio")
+async def test_ensure_media_clients_only_restarts_on_port_change(monkeypatch):
+    app = ClientApp(username=None, server_host="localhost")
+    app._username = "alice"
+    app._video_client = MagicMock(stop=AsyncMock())
+    app._audio_client = MagicMock(stop=AsyncMock())
+    monkeypatch.setattr(
+        app_module, "VideoClient", MagicMock(return_value=MagicMock(start=AsyncMock()))
+    )
+    monkeypatch.setattr(
+        app_module, "AudioClient", MagicMock(return_value=MagicMock(start=AsyncMock()))
+    )
+    monkeypatch.setattr(app, "_start_latency_probe", AsyncMock())
+    file_client = app._file_client = object()
+
+    await app._ensure_media_clients({"video_port": app._video_port})
+    assert app._file_client is file_client
+
+    await app._ensure_media_clients({"latency_port": 50010})
+    assert app._latency_port == 50010
+    assert app._file_client is not file_client
+
+
+@pytest.mark.anyio("asyncio")
+async def test_flushed_presence_batch_is_queued_before_a_later_sync():
+    app = ClientApp(username=None, server_host="localhost")
+    tab = _FakeSocket()
+    await app._ws_hub.connect(tab)
+    app._presence["bob"] = PresenceEntry(username="bob", hand_raised=True)
+    app._mark_presence_dirty("bob")
+
+    app._presence_flush_handle.cancel()
+    app._flush_presence()
+    del app._presence["bob"]
+    await app._broadcast_presence_sync()
+    await asyncio.sleep(0)
+
+    assert [message["type"] for message in tab.received()] == ["presence_batch", "presence_sync"]
+    assert tab.received()[-1]["payload"]["participants"] == []
+    await app._ws_hub.disconnect(tab)
+
+
+def _upload_request(
+    body: bytes, *, chunk_size: int = 64 * 1024, content_length: bool = True
+) -> Request:
+    messages = [
+        {"type": "http.request", "body": body[start : start + chunk_size], "more_body": True}
+        for start in range(0, len(body), chunk_size)
+    ]
+    messages.append({"type": "http.request", "body": b"", "more_body": False})
+
+    async def receive():
+        return messages.pop(0)
+
+    headers = [(b"content-length", str(len(body)).encode())] if content_length else []
+    return Request({"type": "http", "method": "POST", "headers": headers}, receive)
+
+
+def test_upload_size_comes_from_content_length():
+    app = ClientApp(username=None, server_host="localhost")
+    assert app._declared_upload_size(_upload_request(b"abc")) == 3
+
+    with pytest.raises(HTTPException) as excinfo:
+        app._declared_upload_size(_upload_request(b"abc", content_length=False))
+    assert excinfo.value.status_code == 411
+
+
+@pytest.mark.anyio("asyncio")
+async def test_download_is_delegated_to_proxy_when_prefix_configured():
+    app = ClientApp(
+        username=None, server_host="localhost", download_redirect_prefix="/internal/files/"
+    )
+    app._file_client = object()
+    app._file_catalog["abc 1"] = {"file_id": "abc 1", "filename": "report.pdf"}
+    endpoint = next(
+        route.endpoint for route in app._app.routes if route.path == "/api/files/download/{file_id}"
+    )
+
+    response = await endpoint("abc 1")
+    assert response.headers["x-accel-redirect"] == "/internal/files/abc%201"
+    assert response.headers["content-disposition"] == 'attachment; filename="report.pdf"'
+    assert response.body == b""
+
+    with pytest.raises(HTTPException) as excinfo:
+        await endpoint("missing")
+    assert excinfo.value.status_code == 404
+
+
+@pytest.mark.anyio("asyncio")
+async def test_download_hands_coalesced_file_stream_to_response():
+    app = ClientApp(username=None, server_host="localhost")
+
+    async def stream():
+        yield b"data"
+
+    body = stream()
+    app._file_client = MagicMock(download=AsyncMock(return_value=({"filename": "a.bin"}, body)))
+    endpoint = next(
+        route.endpoint for route in app._app.routes if route.path == "/api/files/download/{file_id}"
+    )
+
+    response = await endpoint("abc")
+    app._file_client.download.assert_awaited_once_with(
+        "abc", min_chunk_size=DOWNLOAD_COALESCE_BYTES
+    )
+    assert response.body_iterator is body
+    assert [chunk async for chunk in response.body_iterator] == [b"data"]
+
+
+@pytest.mark.anyio("asyncio")
+async def test_index_page_is_read_once(monkeypatch):
+    app = ClientApp(username=None, server_host="localhost")
+    endpoint = next(
+        route.endpoint for route in app._app.routes if getattr(route, "path", None) == "/"
+    )
+    first = await endpoint()
+
+    reads = []
+    monkeypatch.setattr(pathlib.Path, "read_bytes", lambda self: reads.append(self) or b"")
+    second = await endpoint()
+
+    assert reads == []
+    assert second.body == first.body
+    assert second.headers["content-type"] == "text/html; charset=utf-8"
+
+
+@pytest.mark.anyio("asyncio")
+async def test_upload_progress_is_throttled_but_reports_completion():
+    app = ClientApp(username=None, server_host="localhost")
+    tab = _FakeSocket()
+    await app._ws_hub.connect(tab)
+
+    class _FakeFileClient:
+        async def upload(self, filename, chunks, total_size, *, progress=None):
+            sent = 0
+            async for chunk in chunks:
+                sent += len(chunk)
+                await progress(sent, total_size)
+            return "file-1"
+
+    app._file_client = _FakeFileClient()
+    data = b"x" * (64 * 1024 * 10)
+    endpoint = next(
+        route.endpoint
+        for route in app._app.routes
+        if getattr(route, "path", None) == "/api/files/upload"
+    )
+
+    assert await endpoint(_upload_request(data), "big.bin") == {"status": "ok", "file_id": "file-1"}
+
+    await asyncio.sleep(0)
+    progress = [
+        message["payload"] for message in tab.received() if message["type"] == "file_progress"
+    ]
+    assert len(progress) == 2
+    assert progress[-1]["received"] == len(data)
+    assert progress[-1]["filename"] == "big.bin"
+    await app._ws_hub.disconnect(tab)
+
+
+@pytest.mark.anyio("asyncio")
+async def test_control_frames_are_not_queued_without_ui_tabs():
+    app = ClientApp(username=None, server_host="localhost")
+
+    await app._handle_control_message(ControlAction.REACTION, {"username": "bob", "reaction": "+1"})
+
+    assert app._outgoing_frames == []
+    assert app._outgoing_flush_handle is None
+    assert app._reaction_log[-1]["reaction"] == "+1"
+
+
+@pytest.mark.anyio("asyncio")
+async def test_file_catalog_evicts_least_recently_offered():
+    app = ClientApp(username=None, server_host="localhost")
+
+    for index in range(FILE_CATALOG_LIMIT + 2):
+        await app._handle_control_message(ControlAction.FILE_OFFER, {"file_id": f"f{index}"})
+    await app._handle_control_message(
+        ControlAction.FILE_OFFER, {"file_id": "f2", "filename": "again"}
+    )
+    await app._handle_control_message(ControlAction.FILE_OFFER, {"file_id": "new"})
+
+    assert len(app._file_catalog) == FILE_CATALOG_LIMIT
+    assert "f0" not in app._file_catalog and "f1" not in app._file_catalog
+    assert "f3" not in app._file_catalog
+    assert list(app._file_catalog)[-2:] == ["f2", "new"]
+
+
+@pytest.mark.anyio("asyncio")
+async def test_video_frame_is_sent_as_binary():
+    app = ClientApp(username=None, server_host="localhost")
+    tab = _FakeSocket()
+    await app._ws_hub.connect(tab)
+
+    app._handle_video_frame("zoë", b"\xff\xd8jpeg")
+    await asyncio.sleep(0)
+
+    assert tab.sent == [b"\x00\x04zo\xc3\xab\xff\xd8jpeg"]
+    await app._ws_hub.disconnect(tab)
+
+
+@pytest.mark.anyio("asyncio")
+async def test_hub_writer_sends_binary_frames_between_batches():
+    hub = WebSocketHub()
+    tab = _FakeSocket()
+    await hub.connect(tab)
+    connection = hub._connections[tab]
+    connection.writer.cancel()
+    await asyncio.sleep(0)
+
+    hub.broadcast_text('{"type":"a"}')
+    hub.broadcast_latest("video_frame:alice", b"frame")
+    hub.broadcast_text('{"type":"b"}')
+    hub.broadcast_text('{"type":"c"}')
+
+    connection.writer = asyncio.create_task(hub._writer(tab, connection))
+    await asyncio.sleep(0)
+    assert tab.sent[:2] == ['{"type":"a"}', b"frame"]
+    assert len(tab.sent) == 3
+    assert tab.received() == [{"type": "a"}, {"type": "b"}, {"type": "c"}]
+    await hub.disconnect(tab)
+
+
+@pytest.mark.anyio("asyncio")
+async def test_video_frames_are_latest_wins_per_participant():
+    hub = WebSocketHub()
+    tab = _FakeSocket()
+    await hub.connect(tab)
+    connection = hub._connections[tab]
+    connection.writer.cancel()
+    await asyncio.sleep(0)
+
+    for frame in ("a1", "a2", "a3"):
+        hub.broadcast_latest("video_frame:alice", f'{{"type":"video_frame","frame":"{frame}"}}')
+    hub.broadcast_latest("video_frame:bob", '{"type":"video_frame","frame":"b1"}')
+    hub.broadcast_text('{"type":"chat"}')
+
+    assert connection.queue.qsize() == 3
+    assert set(connection.latest) == {"video_frame:alice", "video_frame:bob"}
+
+    connection.writer = asyncio.create_task(hub._writer(tab, connection))
+    await asyncio.sleep(0)
+    # The three queued frames left in a single batch message.
+    assert len(tab.sent) == 1
+    assert tab.received() == [
+        {"type": "video_frame", "frame": "a3"},
+        {"type": "video_frame", "frame": "b1"},
+        {"type": "chat"},
+    ]
+    assert connection.latest == {}
+    await hub.disconnect(tab)
+
+
+@pytest.mark.anyio("asyncio")
+async def test_hub_writer_caps_batch_size():
+    hub = WebSocketHub()
+    tab = _FakeSocket()
+    await hub.connect(tab)
+    for index in range(UI_WRITE_BATCH_LIMIT + 1):
+        hub.broadcast_text(f'{{"type":"n","i":{index}}}')
+    await asyncio.sleep(0)
+
+    assert len(tab.sent) == 2
+    assert [message["i"] for message in tab.received()] == list(range(UI_WRITE_BATCH_LIMIT + 1))
+    await hub.disconnect(tab)
+
+
+@pytest.mark.anyio("asyncio")
+async def test_session_status_defaults_username_and_keeps_explicit_none():
+    app = ClientApp(username="prefill", server_host="localhost")
+    tab = _FakeSocket()
+    await app._ws_hub.connect(tab)
+
+    await app._broadcast_session_status("idle")
+    await app._broadcast_session_status("error", username=None, message="boom")
+    await asyncio.sleep(0)
+
+    assert [message["payload"] for message in tab.received()] == [
+        {"state": "idle", "username": "prefill", "message": None},
+        {"state": "error", "username": None, "message": "boom"},
+    ]
+    await app._ws_hub.disconnect(tab)
+
+
+@pytest.mark.anyio("asyncio")
+async def test_browser_launch_failure_is_logged(caplog):
+    launch = asyncio.get_running_loop().create_future()
+    launch.add_done_callback(app_module._log_browser_launch_failure)
+    launch.set_exception(RuntimeError("no display"))
+    await asyncio.sleep(0)
+
+    assert "Unable to open the web UI in a browser" in caplog.text
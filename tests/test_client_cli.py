@@ -0,0 +1,57 @@
+import pytest
+
+from client.__main__ import _parse_args
+
+
+def test_parse_args_defaults() -> None:
+    args = _parse_args([])
+
+    assert args.server_host is None
+    assert args.tcp_port is None
+    assert args.ui_host == "127.0.0.1"
+    assert args.ui_port == 8100
+    assert args.username is None
+    assert args.log_level == "INFO"
+
+
+def test_parse_args_accepts_separate_and_inline_values() -> None:
+    args = _parse_args(["10.0.0.5", "--tcp-port", "56000", "--ui-port=9000", "--username", "alex"])
+
+    assert args.server_host == "10.0.0.5"
+    assert args.tcp_port == 56000
+    assert args.ui_port == 9000
+    assert args.username == "alex"
+
+
+def test_parse_args_defers_to_argparse_for_abbreviations() -> None:
+    args = _parse_args(["host", "--user", "sam"])
+
+    assert args.username == "sam"
+
+
+def test_parse_args_rejects_invalid_port() -> None:
+    with pytest.raises(SystemExit):
+        _parse_args(["host", "--ui-port", "abc"])
+
+
+def test_parse_args_does_not_take_an_option_as_a_value() -> None:
+    with pytest.raises(SystemExit):
+        _parse_args(["host", "--username", "--no-browser"])
+
+
+def test_parse_args_normalises_log_level() -> None:
+    assert _parse_args(["--log-level", "debug"]).log_level == "DEBUG"
+
+    with pytest.raises(SystemExit):
+        _parse_args(["--log-level", "verbose"])
+
+
+def test_parse_args_no_browser_flag() -> None:
+    assert _parse_args([]).no_browser is False
+    assert _parse_args(["host", "--no-browser", "--ui-port", "9000"]).no_browser is True
+
+
+def test_parse_args_download_redirect_prefix() -> None:
+    assert _parse_args([]).download_redirect_prefix is None
+    args = _parse_args(["host", "--download-redirect-prefix=/internal/files"])
+    assert args.download_redirect_prefix == "/internal/files"
@@ -67,3 +67,25 @@ async def test_client_auto_leaves_when_status_already_expired(monkeypatch):
     assert leave_mock.await_args.kwargs["reason"] == TIME_LIMIT_LEAVE_REASON
 
     app._cancel_time_limit_watch()
+
+
+@pytest.mark.anyio("asyncio")
+async def test_client_reschedule_reuses_watcher_and_moves_deadline(monkeypatch):
+    app = ClientApp(username=None, server_host="localhost")
+    app._connected = True
+    leave_mock = AsyncMock()
+    monkeypatch.setattr(app, "_leave_session", leave_mock)
+
+    now = time.time()
+    app._schedule_time_limit_watch({"is_active": True, "end_timestamp": now + 0.05})
+    watcher = app._time_limit_watcher_task
+    app._schedule_time_limit_watch({"is_active": True, "end_timestamp": now + 0.2})
+
+    await asyncio.sleep(0.1)
+    assert app._time_limit_watcher_task is watcher
+    assert leave_mock.await_count == 0
+
+    await asyncio.sleep(0.2)
+    assert leave_mock.await_count == 1
+
+    watcher.cancel()
@@ -0,0 +1,73 @@
+import asyncio
+import json
+import struct
+
+import pytest
+
+import client.file_client as file_client_module
+from client.file_client import FileClient
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class _FakeWriter:
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.closed = False
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    async def wait_closed(self):
+        pass
+
+
+def _frame(payload: bytes) -> bytes:
+    return struct.pack("!I", len(payload)) + payload
+
+
+def _serve(monkeypatch, chunks):
+    reader = asyncio.StreamReader()
+    reader.feed_data(_frame(json.dumps({"status": "ok", "filename": "a.bin"}).encode()))
+    for chunk in chunks:
+        reader.feed_data(_frame(chunk))
+    reader.feed_data(_frame(b""))
+    reader.feed_eof()
+    writer = _FakeWriter()
+
+    async def open_connection(host, port):
+        return reader, writer
+
+    monkeypatch.setattr(file_client_module.asyncio, "open_connection", open_connection)
+    return writer
+
+
+@pytest.mark.anyio("asyncio")
+async def test_download_coalesces_frames_into_larger_chunks(monkeypatch):
+    piece = b"x" * (64 * 1024)
+    writer = _serve(monkeypatch, [piece] * 5)
+
+    metadata, stream = await FileClient("localhost").download("abc", min_chunk_size=128 * 1024)
+    chunks = [chunk async for chunk in stream]
+
+    assert metadata["filename"] == "a.bin"
+    assert [len(chunk) for chunk in chunks] == [128 * 1024, 128 * 1024, len(piece)]
+    assert writer.closed
+
+
+@pytest.mark.anyio("asyncio")
+async def test_download_passes_frames_through_by_default(monkeypatch):
+    _serve(monkeypatch, [b"ab", b"cd"])
+
+    _, stream = await FileClient("localhost").download("abc")
+
+    assert [chunk async for chunk in stream] == [b"ab", b"cd"]
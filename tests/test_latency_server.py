@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from server.latency_server import LatencyServer
+from shared.protocol import (
+    LATENCY_PROBE_PREFIX_STRUCT,
+    LATENCY_PROBE_VERSION,
+    LATENCY_REPLY_STRUCT,
+    latency_probe_tag,
+)
+
+
+class _Collector(asyncio.DatagramProtocol):
+    def __init__(self) -> None:
+        self.replies: asyncio.Queue[bytes] = asyncio.Queue()
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.replies.put_nowait(data)
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+async def _probe(server_key, client_key, sequence: int = 7, tag_sequence=None):
+    server = LatencyServer(pre_shared_key=server_key)
+    await server.start("127.0.0.1", 0)
+    port = server._transport.get_extra_info("sockname")[1]
+    loop = asyncio.get_running_loop()
+    transport, collector = await loop.create_datagram_endpoint(
+        _Collector, local_addr=("127.0.0.1", 0)
+    )
+    try:
+        prefix = LATENCY_PROBE_PREFIX_STRUCT.pack(LATENCY_PROBE_VERSION, sequence, 123456)
+        # A tag signed for another sequence must not authorise this probe.
+        signed = LATENCY_PROBE_PREFIX_STRUCT.pack(
+            LATENCY_PROBE_VERSION, sequence if tag_sequence is None else tag_sequence, 123456
+        )
+        packet = prefix + latency_probe_tag(signed, b"alice", client_key) + b"alice"
+        transport.sendto(packet, ("127.0.0.1", port))
+        try:
+            return await asyncio.wait_for(collector.replies.get(), timeout=0.5)
+        except asyncio.TimeoutError:
+            return None
+    finally:
+        transport.close()
+        await server.stop()
+
+
+@pytest.mark.anyio
+async def test_binary_probe_is_echoed() -> None:
+    reply = await _probe("secret", "secret")
+
+    assert reply is not None
+    version, sequence, timestamp_ms, server_timestamp_ms = LATENCY_REPLY_STRUCT.unpack(reply)
+    assert version == LATENCY_PROBE_VERSION
+    assert sequence == 7
+    assert timestamp_ms == 123456
+    assert server_timestamp_ms > 0
+
+
+@pytest.mark.anyio
+async def test_binary_probe_with_wrong_key_is_dropped() -> None:
+    assert await _probe("secret", "guess") is None
+
+
+@pytest.mark.anyio
+async def test_binary_probe_with_tag_for_other_sequence_is_dropped() -> None:
+    assert await _probe("secret", "secret", sequence=8, tag_sequence=7) is None
@@ -0,0 +1,23 @@
+from client.video_client import VideoClient, stream_id_for
+from shared.protocol import MediaFrameHeader, PayloadType
+
+
+def _datagram(username: str, payload: bytes) -> bytes:
+    header = MediaFrameHeader(
+        stream_id=stream_id_for(username),
+        sequence_number=1,
+        timestamp_ms=0.0,
+        payload_type=PayloadType.VIDEO.value,
+    )
+    return header.pack() + payload
+
+
+def test_received_frames_are_delivered_synchronously():
+    frames = []
+    client = VideoClient("alice", "localhost", 0, lambda name, frame: frames.append((name, frame)))
+    client.update_peers(["alice", "bob"])
+
+    client._on_datagram(_datagram("bob", b"jpeg"))
+    client._on_datagram(_datagram("alice", b"own"))
+
+    assert frames == [("bob", b"jpeg")]